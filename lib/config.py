@@ -3,10 +3,40 @@ Configuration Management for OC-Memory
 Loads and validates YAML configuration files
 """
 
+import copy
+import functools
+import os
 import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+# Prefer the libyaml-backed loader when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# Home directory resolved once; expanduser() re-reads the environment
+_HOME = os.path.expanduser('~')
+
+
+def resolve_path(path: str) -> str:
+    """
+    Expand ~ and resolve a path to an absolute, symlink-free string
+
+    Equivalent to str(Path(path).expanduser().resolve()) without building
+    intermediate Path objects or re-reading HOME for every call.
+
+    Args:
+        path: Path string, optionally starting with ~
+
+    Returns:
+        Resolved absolute path string
+    """
+    if path == '~' or path.startswith(('~/', '~' + os.sep)):
+        path = _HOME + path[1:]
+    elif path.startswith('~'):
+        path = os.path.expanduser(path)  # ~user form
+    return os.path.realpath(path)
+
 
 class ConfigError(Exception):
     """Configuration-related errors"""
@@ -32,8 +62,8 @@ def load_config(config_path: str = "config.yaml") -> Dict[str, Any]:
         raise ConfigError(f"Config file not found: {config_path}")
 
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
+        with open(path, 'rb') as f:
+            config = yaml.load(f, Loader=_YAML_LOADER)
     except yaml.YAMLError as e:
         raise ConfigError(f"Invalid YAML in config file: {e}")
 
@@ -86,33 +116,74 @@ def expand_paths(config: Dict[str, Any]) -> Dict[str, Any]:
     # Expand watch directories
     if 'watch' in config and 'dirs' in config['watch']:
         config['watch']['dirs'] = [
-            str(Path(d).expanduser().resolve())
-            for d in config['watch']['dirs']
+            resolve_path(d) for d in config['watch']['dirs']
         ]
 
     # Expand memory directory
     if 'memory' in config and 'dir' in config['memory']:
-        config['memory']['dir'] = str(
-            Path(config['memory']['dir']).expanduser().resolve()
-        )
+        config['memory']['dir'] = resolve_path(config['memory']['dir'])
 
     return config
 
 
+def _validate_and_expand(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate and expand paths in a single pass over the loaded config
+
+    Same checks and results as validate_config() followed by
+    expand_paths(), but each path value is visited only once.
+
+    Raises:
+        ConfigError: If configuration is invalid
+    """
+    watch = config['watch']
+    dirs = watch.get('dirs') if isinstance(watch, dict) else None
+    if dirs is None:
+        raise ConfigError("Missing 'dirs' in watch section")
+    if not isinstance(dirs, list):
+        raise ConfigError("'watch.dirs' must be a list")
+    watch['dirs'] = [resolve_path(d) for d in dirs]
+
+    memory = config['memory']
+    if not isinstance(memory, dict) or 'dir' not in memory:
+        raise ConfigError("Missing 'dir' in memory section")
+    memory['dir'] = resolve_path(memory['dir'])
+
+    return config
+
+
+@functools.lru_cache(maxsize=8)
+def _load_cached(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """
+    Run the load and validate/expand passes once per file revision
+
+    The mtime and size arguments are only part of the cache key, so an
+    edited config file misses the cache and is parsed again.
+    """
+    return _validate_and_expand(load_config(config_path))
+
+
 def get_config(config_path: str = "config.yaml") -> Dict[str, Any]:
     """
     Load, validate, and expand configuration
 
+    Results are memoized per (path, mtime, size); each caller receives
+    its own copy so mutations never leak into the cache.
+
     Args:
         config_path: Path to YAML configuration file
 
     Returns:
         Validated and expanded configuration dictionary
     """
-    config = load_config(config_path)
-    validate_config(config)
-    config = expand_paths(config)
-    return config
+    path = Path(config_path).expanduser()
+    try:
+        st = path.stat()
+    except OSError:
+        raise ConfigError(f"Config file not found: {config_path}")
+
+    config = _load_cached(str(path.resolve()), st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(config)
 
 
 # Example usage
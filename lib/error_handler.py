@@ -6,7 +6,9 @@ Provides automatic retry logic for LLM API calls
 with configurable backoff strategy.
 """
 
+import asyncio
 import logging
+import random
 import time
 from functools import wraps
 from typing import Callable, Any, Optional, Type, Tuple
@@ -40,6 +42,7 @@ class LLMRetryPolicy:
         max_delay: float = 30.0,
         multiplier: float = 2.0,
         retryable_exceptions: Optional[Tuple[Type[Exception], ...]] = None,
+        jitter: float = 0.0,
     ):
         """
         Args:
@@ -48,11 +51,14 @@ class LLMRetryPolicy:
             max_delay: Maximum delay in seconds
             multiplier: Delay multiplier for exponential backoff
             retryable_exceptions: Exception types to retry (default: all)
+            jitter: Upper bound in seconds of random delay added to each
+                    backoff, so concurrent callers don't retry in lockstep
         """
         self.max_attempts = max_attempts
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.multiplier = multiplier
+        self.jitter = jitter
         self.retryable_exceptions = retryable_exceptions or (Exception,)
 
         # Statistics
@@ -88,7 +94,7 @@ class LLMRetryPolicy:
             except self.retryable_exceptions as e:
                 last_error = e
                 if attempt < self.max_attempts:
-                    delay = self._calculate_delay(attempt)
+                    delay = self._backoff_delay(attempt)
                     self.total_retries += 1
                     logger.warning(
                         f"Attempt {attempt}/{self.max_attempts} failed: {e}. "
@@ -104,10 +110,24 @@ class LLMRetryPolicy:
 
         raise RetryExhaustedError(last_error, self.max_attempts)
 
-    async def call_with_retry_async(self, func: Callable, *args, **kwargs) -> Any:
-        """Async version of call_with_retry"""
-        import asyncio
+    async def acall_with_retry(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Async version of call_with_retry.
+
+        Backoff uses asyncio.sleep, so other coroutines on the loop keep
+        running while this call waits to retry.
 
+        Args:
+            func: Coroutine function to call
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Awaited function return value
+
+        Raises:
+            RetryExhaustedError: If all attempts fail
+        """
         self.total_calls += 1
         last_error = None
 
@@ -121,7 +141,7 @@ class LLMRetryPolicy:
             except self.retryable_exceptions as e:
                 last_error = e
                 if attempt < self.max_attempts:
-                    delay = self._calculate_delay(attempt)
+                    delay = self._backoff_delay(attempt)
                     self.total_retries += 1
                     logger.warning(
                         f"Attempt {attempt}/{self.max_attempts} failed: {e}. "
@@ -137,11 +157,21 @@ class LLMRetryPolicy:
 
         raise RetryExhaustedError(last_error, self.max_attempts)
 
+    # Kept for existing callers
+    call_with_retry_async = acall_with_retry
+
     def _calculate_delay(self, attempt: int) -> float:
         """Calculate delay for given attempt number"""
         delay = self.base_delay * (self.multiplier ** (attempt - 1))
         return min(delay, self.max_delay)
 
+    def _backoff_delay(self, attempt: int) -> float:
+        """Delay before the next attempt, including jitter"""
+        delay = self._calculate_delay(attempt)
+        if self.jitter:
+            delay = min(delay + random.uniform(0, self.jitter), self.max_delay)
+        return delay
+
     def get_stats(self) -> dict:
         """Get retry statistics"""
         return {
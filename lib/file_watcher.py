@@ -3,11 +3,164 @@ File Watcher for OC-Memory
 Monitors user directories for supported file changes
 """
 
+import errno
+import fnmatch
 import logging
+import os
+import queue
+import re
+import sys
+import threading
+import time
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler, FileSystemEvent
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import (
+    FileSystemEventHandler,
+    FileSystemEvent,
+    DirCreatedEvent,
+    DirMovedEvent,
+    FileClosedEvent,
+    FileCreatedEvent,
+    FileMovedEvent,
+)
+
+from lib.config import resolve_path
+
+try:
+    if not sys.platform.startswith('linux'):
+        raise ImportError("inotify is Linux-only")
+    from watchdog.observers.inotify import InotifyObserver
+except ImportError:
+    InotifyObserver = None
+
+# On inotify, subscribe only to completed writes, creations, and renames
+# (IN_CLOSE_WRITE | IN_CREATE | IN_MOVE) so a save surfaces as one event
+_INOTIFY_EVENT_FILTER = [FileCreatedEvent, FileClosedEvent, FileMovedEvent]
+# Leaf-only watching also needs new directories to extend its watch set
+_INOTIFY_LEAF_EVENT_FILTER = _INOTIFY_EVENT_FILTER + [DirCreatedEvent, DirMovedEvent]
+
+# Filesystems where kernel change notifications miss remote writes
+_NETWORK_FS_TYPES = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3', 'afs', '9p', 'fuse.sshfs',
+})
+
+# Per-user inotify watch limit; recursive watches need one per directory
+_INOTIFY_MAX_WATCHES = '/proc/sys/fs/inotify/max_user_watches'
+
+# Lowercase extensions matched against the tail of raw event paths
+_MARKDOWN_EXTS = ('.md', '.markdown')
+_SUPPORTED_EXTS = _MARKDOWN_EXTS + ('.jsonl',)
+# Longest extension length; only this many trailing chars need lowercasing
+_EXT_TAIL = max(len(ext) for ext in _SUPPORTED_EXTS)
+
+
+def _inotify_watch_limit() -> Optional[int]:
+    """Read fs.inotify.max_user_watches, or None when unavailable"""
+    try:
+        with open(_INOTIFY_MAX_WATCHES, encoding='utf-8') as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def _is_network_fs(path: Path) -> bool:
+    """
+    Check whether a path lives on a network filesystem (Linux only)
+
+    Looks up the longest matching mount point in /proc/mounts; returns
+    False when the mount table is unavailable.
+    """
+    try:
+        with open('/proc/mounts', encoding='utf-8') as f:
+            mounts = [line.split()[1:3] for line in f if line.strip()]
+    except OSError:
+        return False
+
+    target = str(path)
+    best_len, best_type = -1, ''
+    for mount_point, fs_type in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        if target == mount_point or target.startswith(mount_point.rstrip(os.sep) + os.sep):
+            if len(mount_point) > best_len:
+                best_len, best_type = len(mount_point), fs_type
+    return best_type in _NETWORK_FS_TYPES
+
+
+class _BatchDispatcher:
+    """
+    Coalesces bursts of file events into one callback per path
+    Each path is held until it has been quiet for the batch window, so
+    activity on one file never delays another; reaching max_batch
+    pending paths flushes them all at once
+    """
+
+    def __init__(self, callback: Callable, window_ms: int = 200, max_batch: int = 64):
+        """
+        Args:
+            callback: Function to call once per path on flush
+            window_ms: Quiet period a path needs before it is flushed
+            max_batch: Number of pending paths that forces an immediate flush
+        """
+        self.callback = callback
+        self.window = window_ms / 1000.0
+        self.max_batch = max(1, int(max_batch))
+        # path -> (event type, deadline); re-inserted on every event, so
+        # with a fixed window the dict stays ordered by deadline
+        self._pending: Dict[str, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self.logger = logging.getLogger(__name__)
+
+    def submit(self, path: str, event_type: str) -> None:
+        """Queue an event, keeping only the most recent type per path"""
+        with self._lock:
+            self._pending.pop(path, None)
+            self._pending[path] = (event_type, time.monotonic() + self.window)
+            flush_now = len(self._pending) >= self.max_batch
+            if not flush_now and self._timer is None:
+                self._arm_timer(self.window)
+
+        if flush_now:
+            self.flush()
+
+    def _arm_timer(self, delay: float) -> None:
+        """Schedule _flush_due; caller holds the lock"""
+        self._timer = threading.Timer(max(0.0, delay), self._flush_due)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _flush_due(self) -> None:
+        """Flush paths whose quiet period has passed, then re-arm"""
+        now = time.monotonic()
+        batch: Dict[str, str] = {}
+        with self._lock:
+            self._timer = None
+            for path, (event_type, deadline) in list(self._pending.items()):
+                if deadline > now:
+                    self._arm_timer(deadline - now)
+                    break
+                del self._pending[path]
+                batch[path] = event_type
+        self._run(batch)
+
+    def flush(self) -> None:
+        """Invoke the callback for every pending path"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+        self._run({path: event_type for path, (event_type, _) in pending.items()})
+
+    def _run(self, batch: Dict[str, str]) -> None:
+        for path, event_type in batch.items():
+            file_path = Path(path)
+            try:
+                self.callback(file_path, event_type=event_type)
+            except Exception as e:
+                self.logger.error(f"Error in callback for {file_path}: {e}")
 
 
 class MarkdownFileHandler(FileSystemEventHandler):
@@ -16,53 +169,109 @@ class MarkdownFileHandler(FileSystemEventHandler):
     Filters for markdown and JSONL files and triggers callback
     """
 
-    def __init__(self, callback: Optional[Callable] = None):
+    def __init__(
+        self,
+        callback: Optional[Callable] = None,
+        batch_window_ms: int = 0,
+        max_batch: int = 64,
+        patterns: Optional[List[str]] = None,
+        dir_callback: Optional[Callable] = None
+    ):
         """
         Args:
             callback: Function to call when markdown file changes
                       Signature: callback(file_path: Path, event_type: str)
+            batch_window_ms: Coalesce events per path within this window
+                             (0 dispatches every event immediately)
+            max_batch: Pending path count that forces an early flush
+            patterns: Optional filename globs (e.g. "*.md") further
+                      narrowing which supported files are reported
+            dir_callback: Function called with the path of each directory
+                          created or moved into the tree
         """
         super().__init__()
         self.callback = callback
+        self.dir_callback = dir_callback
         self.logger = logging.getLogger(__name__)
+        # All globs folded into one case-insensitive regex over the basename
+        self._pattern_re = None
+        if patterns:
+            self._pattern_re = re.compile(
+                '|'.join(fnmatch.translate(p) for p in patterns), re.IGNORECASE
+            )
+        self.dispatcher: Optional[_BatchDispatcher] = None
+        if callback and batch_window_ms > 0:
+            self.dispatcher = _BatchDispatcher(callback, batch_window_ms, max_batch)
+
+    def _dispatch(self, path: str, event_type: str) -> None:
+        """Hand an event to the batcher, or straight to the callback"""
+        if not self.callback:
+            return
+
+        if self.dispatcher:
+            self.dispatcher.submit(path, event_type)
+            return
+
+        file_path = Path(path)
+        try:
+            self.callback(file_path, event_type=event_type)
+        except Exception as e:
+            self.logger.error(f"Error in callback for {file_path}: {e}")
+
+    def flush(self) -> None:
+        """Deliver any events still held by the batcher"""
+        if self.dispatcher:
+            self.dispatcher.flush()
 
     def _is_supported_file(self, path: str) -> bool:
         """Check if file is a supported file for OC-Memory processing."""
-        return Path(path).suffix.lower() in ['.md', '.markdown', '.jsonl']
+        if not path[-_EXT_TAIL:].lower().endswith(_SUPPORTED_EXTS):
+            return False
+        if self._pattern_re is None:
+            return True
+        return self._pattern_re.match(os.path.basename(path)) is not None
 
     def _is_markdown_file(self, path: str) -> bool:
         """Backward-compatible helper for markdown-only checks."""
-        return Path(path).suffix.lower() in ['.md', '.markdown']
+        return path[-_EXT_TAIL:].lower().endswith(_MARKDOWN_EXTS)
 
     def on_created(self, event: FileSystemEvent) -> None:
         """Handle file creation events"""
         if event.is_directory:
+            if self.dir_callback:
+                self.dir_callback(event.src_path)
             return
 
-        if self._is_supported_file(event.src_path):
-            file_path = Path(event.src_path)
-            self.logger.info(f"New supported file detected: {file_path}")
-
-            if self.callback:
-                try:
-                    self.callback(file_path, event_type='created')
-                except Exception as e:
-                    self.logger.error(f"Error in callback for {file_path}: {e}")
+        src_path = event.src_path
+        if self._is_supported_file(src_path):
+            self.logger.info(f"New supported file detected: {src_path}")
+            self._dispatch(src_path, 'created')
 
     def on_modified(self, event: FileSystemEvent) -> None:
         """Handle file modification events"""
         if event.is_directory:
             return
 
-        if self._is_supported_file(event.src_path):
-            file_path = Path(event.src_path)
-            self.logger.debug(f"Supported file modified: {file_path}")
+        src_path = event.src_path
+        if self._is_supported_file(src_path):
+            self.logger.debug(f"Supported file modified: {src_path}")
+            self._dispatch(src_path, 'modified')
 
-            if self.callback:
-                try:
-                    self.callback(file_path, event_type='modified')
-                except Exception as e:
-                    self.logger.error(f"Error in callback for {file_path}: {e}")
+    def on_closed(self, event: FileSystemEvent) -> None:
+        """Handle close-after-write events (inotify IN_CLOSE_WRITE)"""
+        self.on_modified(event)
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        """Handle renames; editors save atomically by renaming a temp file"""
+        if event.is_directory:
+            if self.dir_callback and event.dest_path:
+                self.dir_callback(event.dest_path)
+            return
+
+        dest_path = event.dest_path
+        if dest_path and self._is_supported_file(dest_path):
+            self.logger.debug(f"Supported file replaced: {dest_path}")
+            self._dispatch(dest_path, 'modified')
 
 
 class FileWatcher:
@@ -75,20 +284,83 @@ class FileWatcher:
         self,
         watch_dirs: List[str],
         callback: Optional[Callable] = None,
-        recursive: bool = True
+        recursive: bool = True,
+        batch_window_ms: int = 200,
+        max_batch: int = 64,
+        callback_workers: int = 4,
+        max_pending: int = 1024,
+        use_polling: bool = False,
+        poll_interval: float = 30,
+        patterns: Optional[List[str]] = None,
+        leaf_only: bool = False
     ):
         """
         Args:
             watch_dirs: List of directory paths to watch
             callback: Function to call when files change
             recursive: Watch subdirectories recursively
+            batch_window_ms: Quiet period used to coalesce event bursts
+                             (0 disables batching)
+            max_batch: Pending path count that forces an early flush
+            callback_workers: Threads running the callback off the
+                              watchdog thread
+            max_pending: Queued callbacks allowed before the oldest queued
+                         event is dropped
+            use_polling: Stat-poll instead of using OS change notifications
+                         (also chosen automatically for NFS/CIFS mounts)
+            poll_interval: Seconds between scans when polling
+            patterns: Optional filename globs restricting reported files
+            leaf_only: With recursive, watch only each root plus the
+                       directories that already hold supported files (and
+                       directories created later) instead of every subdir
         """
-        self.watch_dirs = [Path(d).expanduser().resolve() for d in watch_dirs]
+        self.watch_dirs = [Path(resolve_path(d)) for d in watch_dirs]
         self.callback = callback
         self.recursive = recursive
-        self.observer = Observer()
+        self.batch_window_ms = batch_window_ms
+        self.max_batch = max_batch
+        self.patterns = patterns
+        self.leaf_only = leaf_only and recursive
+        self._scheduled: set = set()
+        self.handler: Optional[MarkdownFileHandler] = None
         self.logger = logging.getLogger(__name__)
 
+        # Kernel notifications never fire for writes made by other NFS/CIFS
+        # clients, so those mounts fall back to periodic polling
+        if not use_polling:
+            remote = [d for d in self.watch_dirs if d.exists() and _is_network_fs(d)]
+            if remote:
+                self.logger.info(f"Network filesystem detected, polling: {remote}")
+                use_polling = True
+        self.use_polling = use_polling
+
+        if use_polling:
+            self.observer = PollingObserver(timeout=poll_interval)
+            self.event_filter = None
+        else:
+            # Prefer the inotify backend explicitly on Linux so event masks
+            # can be narrowed; other platforms use their native default
+            self.observer = InotifyObserver() if InotifyObserver else Observer()
+            self.event_filter = None
+            if InotifyObserver:
+                self.event_filter = (
+                    _INOTIFY_LEAF_EVENT_FILTER if self.leaf_only else _INOTIFY_EVENT_FILTER
+                )
+
+        # Callbacks run on worker threads fed by a bounded queue so the
+        # watchdog thread never blocks on LLM calls or file copies and the
+        # kernel event queue keeps draining
+        self.callback_workers = max(1, int(callback_workers))
+        self._queue: "queue.Queue[Optional[Tuple[Path, str]]]" = queue.Queue(
+            maxsize=max(1, int(max_pending))
+        )
+        self._workers: List[threading.Thread] = []
+        self.dropped_events = 0
+        # Paths waiting in the queue; a repeat event for one is folded in
+        self._queued_paths: Set[Path] = set()
+        self._queued_lock = threading.Lock()
+        self.coalesced_events = 0
+
         # Validate watch directories
         for watch_dir in self.watch_dirs:
             if not watch_dir.exists():
@@ -96,26 +368,168 @@ class FileWatcher:
 
     def start(self) -> None:
         """Start watching directories"""
-        handler = MarkdownFileHandler(callback=self.callback)
+        if self.callback:
+            self._start_workers()
+
+        handler = MarkdownFileHandler(
+            callback=self._submit if self.callback else None,
+            batch_window_ms=self.batch_window_ms,
+            max_batch=self.max_batch,
+            patterns=self.patterns,
+            dir_callback=self._watch_new_dir if self.leaf_only else None
+        )
+        self.handler = handler
 
         for watch_dir in self.watch_dirs:
             if not watch_dir.exists():
                 self.logger.warning(f"Skipping non-existent directory: {watch_dir}")
                 continue
 
+            if self.leaf_only:
+                leaves = self._leaf_dirs(str(watch_dir))
+                self.logger.info(
+                    f"Watching directory: {watch_dir} (leaf-only, {len(leaves)} dirs)"
+                )
+                for leaf in leaves:
+                    self._schedule(leaf, recursive=False)
+                continue
+
             self.logger.info(f"Watching directory: {watch_dir} (recursive={self.recursive})")
-            self.observer.schedule(handler, str(watch_dir), recursive=self.recursive)
+            self._schedule(str(watch_dir), recursive=self.recursive)
+
+        backend = type(self.observer).__name__
+        if isinstance(self.observer, PollingObserver) and not self.use_polling:
+            # watchdog found no native backend for this platform
+            self.logger.warning(
+                "No native file notification backend available; falling back "
+                "to stat polling, which rescans every watched tree"
+            )
+        elif InotifyObserver and isinstance(self.observer, InotifyObserver):
+            limit = _inotify_watch_limit()
+            if limit is not None:
+                backend += f", max_user_watches={limit}"
 
-        self.observer.start()
-        self.logger.info("FileWatcher started successfully")
+        try:
+            self.observer.start()
+        except OSError as e:
+            if e.errno in (errno.ENOSPC, errno.EMFILE):
+                self.logger.error(
+                    f"{e.strerror}: raise fs.inotify.max_user_watches / "
+                    f"max_user_instances (sysctl), narrow watch.dirs, set "
+                    f"watch.leaf_only, or set watch.use_polling"
+                )
+            raise
+        self.logger.info(f"FileWatcher started successfully ({backend})")
 
     def stop(self) -> None:
         """Stop watching directories"""
         self.logger.info("Stopping FileWatcher...")
         self.observer.stop()
         self.observer.join()
+        # Drop the watches with the thread, so a later start() schedules
+        # every path again instead of skipping them as already watched
+        self.observer.unschedule_all()
+        self._scheduled.clear()
+        if self.handler:
+            self.handler.flush()
+        self._stop_workers()
         self.logger.info("FileWatcher stopped")
 
+    def _schedule(self, path: str, recursive: bool) -> None:
+        """Register one watch, skipping paths that are already watched"""
+        if path in self._scheduled:
+            return
+        self._scheduled.add(path)
+        self.observer.schedule(
+            self.handler, path,
+            recursive=recursive,
+            event_filter=self.event_filter
+        )
+
+    def _leaf_dirs(self, root: str) -> List[str]:
+        """The root plus every directory below it holding a supported file"""
+        leaves = [root]
+        for dirpath, _, filenames in os.walk(root):
+            if dirpath != root and any(
+                self.handler._is_supported_file(name) for name in filenames
+            ):
+                leaves.append(dirpath)
+        return leaves
+
+    def _watch_new_dir(self, path: str) -> None:
+        """Extend a leaf-only watch set with a directory added at runtime"""
+        try:
+            # A moved-in tree may already contain nested content
+            for dirpath, _, _ in os.walk(path):
+                self._schedule(dirpath, recursive=False)
+        except OSError as e:
+            self.logger.warning(f"Cannot watch new directory {path}: {e}")
+
+    def _start_workers(self) -> None:
+        """Spawn the callback worker threads"""
+        for i in range(self.callback_workers - len(self._workers)):
+            worker = threading.Thread(
+                target=self._worker, name=f"oc-watch-cb-{i}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def _stop_workers(self) -> None:
+        """Let workers drain the queue, then join them"""
+        for _ in self._workers:
+            self._queue.put(None)
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+
+    def _submit(self, file_path: Path, event_type: str) -> None:
+        """Queue a callback for the workers, dropping the oldest when full"""
+        with self._queued_lock:
+            if file_path in self._queued_paths:
+                # Still waiting for a worker, which will read the latest content
+                self.coalesced_events += 1
+                return
+            self._queued_paths.add(file_path)
+
+        item = (file_path, event_type)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                pass
+            try:
+                dropped = self._queue.get_nowait()
+            except queue.Empty:
+                continue
+            self._queue.task_done()
+            if dropped is not None:
+                with self._queued_lock:
+                    self._queued_paths.discard(dropped[0])
+            self.dropped_events += 1
+            self.logger.warning(
+                f"Callback queue full, dropping {dropped[1]} event for {dropped[0]} "
+                f"(dropped: {self.dropped_events})"
+            )
+
+    def _worker(self) -> None:
+        """Run queued callbacks until a stop sentinel arrives"""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                file_path, event_type = item
+                # Events arriving from here on need another callback run
+                with self._queued_lock:
+                    self._queued_paths.discard(file_path)
+                try:
+                    self.callback(file_path, event_type=event_type)
+                except Exception as e:
+                    self.logger.error(f"Error in callback for {file_path}: {e}")
+            finally:
+                self._queue.task_done()
+
     def is_alive(self) -> bool:
         """Check if watcher is running"""
         return self.observer.is_alive()
@@ -123,8 +537,6 @@ class FileWatcher:
 
 # Example usage and testing
 if __name__ == "__main__":
-    import time
-
     # Setup logging
     logging.basicConfig(
         level=logging.INFO,
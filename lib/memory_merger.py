@@ -10,7 +10,9 @@ import logging
 import re
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from lib.observer import ObservationBatch
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +66,8 @@ class MemoryMerger:
         self.memory_dir = Path(memory_dir).expanduser().resolve()
         self.memory_file = self.memory_dir / filename
         self.max_tokens = max_tokens
+        # ((mtime_ns, size), token count) of the memory file as last saved/read
+        self._token_cache: Optional[Tuple[Tuple[int, int], int]] = None
 
         # Ensure directory exists
         self.memory_dir.mkdir(parents=True, exist_ok=True)
@@ -139,6 +143,10 @@ class MemoryMerger:
 
         try:
             self.memory_file.write_text(content, encoding='utf-8')
+            # The content is already in hand, so count it now rather than
+            # rereading the file on the next get_token_count()
+            st = self.memory_file.stat()
+            self._token_cache = ((st.st_mtime_ns, st.st_size), estimate_tokens(content))
             logger.info(f"Memory file saved: {self.memory_file}")
             return self.memory_file
         except Exception as e:
@@ -161,9 +169,9 @@ class MemoryMerger:
         sections = self.load()
         added = 0
 
-        for obs in observations:
-            md_line = obs.to_markdown()
-            section = self._map_category_to_section(obs.category)
+        batch = ObservationBatch.from_observations(observations)
+        for md_line, category in zip(batch.to_markdown_lines(), batch.categories):
+            section = self._map_category_to_section(category)
 
             # Check token limit before adding
             sections[section].insert(0, md_line)  # newest first
@@ -223,10 +231,20 @@ class MemoryMerger:
 
     def get_token_count(self) -> int:
         """Get current token count of memory file"""
-        if not self.memory_file.exists():
+        try:
+            st = self.memory_file.stat()
+        except FileNotFoundError:
             return 0
+
+        # Only edits made outside the merger force a recount
+        signature = (st.st_mtime_ns, st.st_size)
+        if self._token_cache is not None and self._token_cache[0] == signature:
+            return self._token_cache[1]
+
         content = self.memory_file.read_text(encoding='utf-8')
-        return estimate_tokens(content)
+        tokens = estimate_tokens(content)
+        self._token_cache = (signature, tokens)
+        return tokens
 
     def clear_section(self, section: str) -> None:
         """Clear all entries in a section"""
@@ -252,10 +270,12 @@ class MemoryMerger:
 
     def _estimate_section_tokens(self, sections: Dict[str, List[str]]) -> int:
         """Estimate total tokens across all sections"""
-        total_text = ""
-        for lines in sections.values():
-            total_text += '\n'.join(lines) + '\n'
-        return estimate_tokens(total_text)
+        # Words never span lines, so summing per-line counts matches
+        # estimate_tokens() on the joined text without building it
+        words = sum(
+            len(line.split()) for lines in sections.values() for line in lines
+        )
+        return int(words * TOKENS_PER_WORD)
 
     def _trim_to_fit(self, sections: Dict[str, List[str]]) -> None:
         """
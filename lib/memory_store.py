@@ -150,31 +150,56 @@ class MemoryStore:
         Returns:
             List of result dicts with 'id', 'content', 'metadata', 'distance'
         """
+        return self.search_batch([query], n_results=n_results, where=where)[0]
+
+    def search_batch(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Semantic search for several queries in one collection query.
+
+        Args:
+            queries: Search query texts
+            n_results: Number of results to return per query
+            where: Optional metadata filter
+
+        Returns:
+            One list of result dicts per query, in query order
+        """
+        if not queries:
+            return []
+
         self._ensure_initialized()
 
         kwargs = {
-            "query_texts": [query],
+            "query_texts": list(queries),
             "n_results": min(n_results, self.count()),
         }
         if where:
             kwargs["where"] = where
 
         if kwargs["n_results"] == 0:
-            return []
+            return [[] for _ in queries]
 
-        results = self._collection.query(**kwargs)
+        results = self._collection.query(**kwargs) or {}
 
-        items = []
-        if results and results.get('ids'):
-            for i in range(len(results['ids'][0])):
+        batches = []
+        for q in range(len(queries)):
+            items = []
+            ids = results['ids'][q] if results.get('ids') else []
+            for i in range(len(ids)):
                 items.append({
-                    'id': results['ids'][0][i],
-                    'content': results['documents'][0][i] if results.get('documents') else '',
-                    'metadata': results['metadatas'][0][i] if results.get('metadatas') else {},
-                    'distance': results['distances'][0][i] if results.get('distances') else 0.0,
+                    'id': ids[i],
+                    'content': results['documents'][q][i] if results.get('documents') else '',
+                    'metadata': results['metadatas'][q][i] if results.get('metadatas') else {},
+                    'distance': results['distances'][q][i] if results.get('distances') else 0.0,
                 })
+            batches.append(items)
 
-        return items
+        return batches
 
     def get(self, obs_id: str) -> Optional[Dict[str, Any]]:
         """Get a single observation by ID"""
@@ -3,12 +3,55 @@ Memory Writer for OC-Memory
 Writes files to OpenClaw Memory directory with metadata
 """
 
+import functools
+import json
 import logging
+import os
+import re
 import shutil
+import tempfile
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+import yaml
+
+try:
+    import orjson
+
+    def _dumps_line(record: Dict[str, Any]) -> bytes:
+        return orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+
+    def _dumps_line(record: Dict[str, Any]) -> bytes:
+        text = json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+        return (text + "\n").encode("utf-8")
+
+
+# Path keywords in priority order; 'doc' also covers 'document'
+_CATEGORY_KEYWORDS = (
+    ('project', 'projects'),
+    ('note', 'notes'),
+    ('doc', 'documents'),
+    ('meeting', 'meetings'),
+)
+_CATEGORY_RE = re.compile('|'.join(keyword for keyword, _ in _CATEGORY_KEYWORDS))
+
+# Prefer the libyaml-backed dumper when PyYAML was built with it
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+# Keep long values (e.g. source paths) on one line instead of folding at 80
+_YAML_WIDTH = 1 << 16
+
+# Chunk size used when scanning for the end of existing frontmatter
+_HEAD_CHUNK = 8192
+# Buffer size for streaming the body into the rewritten file
+_COPY_BUFSIZE = 1 << 20
+# Write buffer for the metadata index; flushed explicitly by the daemon
+_INDEX_BUFSIZE = 1 << 20
+
 
 class MemoryWriterError(Exception):
     """Memory writer related errors"""
@@ -21,6 +64,9 @@ class MemoryWriter:
     Handles file copying, metadata, and conflict resolution
     """
 
+    # Append-only metadata index inside memory_dir (see record_metadata)
+    INDEX_FILENAME = ".index.jsonl"
+
     def __init__(self, memory_dir: str, max_versions_per_source: int = 5):
         """
         Args:
@@ -30,6 +76,11 @@ class MemoryWriter:
         self.memory_dir = Path(memory_dir).expanduser().resolve()
         self.max_versions_per_source = max(1, int(max_versions_per_source))
         self.logger = logging.getLogger(__name__)
+        # (epoch second, formatted stamp) reused for conflict suffixes
+        self._stamp_cache = (-1, "")
+        # Metadata index handle, opened on first record_metadata()
+        self._index_fh = None
+        self._index_lock = threading.Lock()
 
         # Create memory directory if it doesn't exist
         self.memory_dir.mkdir(parents=True, exist_ok=True)
@@ -70,7 +121,7 @@ class MemoryWriter:
 
         if target_file.exists():
             # Add timestamp to avoid conflicts
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = self._conflict_timestamp()
             stem = source_file.stem
             suffix = source_file.suffix
             target_file = target_dir / f"{stem}_{timestamp}{suffix}"
@@ -78,10 +129,13 @@ class MemoryWriter:
 
         # Copy file
         try:
+            # copyfile uses the zero-copy fast path (sendfile/fcopyfile)
+            # when available; metadata is applied in a separate pass
+            shutil.copyfile(source_file, target_file)
             if preserve_metadata:
-                shutil.copy2(source_file, target_file)
+                shutil.copystat(source_file, target_file)
             else:
-                shutil.copy(source_file, target_file)
+                shutil.copymode(source_file, target_file)
 
             # Keep only recent versions to avoid hot folder bloat
             self._enforce_version_retention(target_dir=target_dir, source_file=source_file)
@@ -91,6 +145,14 @@ class MemoryWriter:
         except Exception as e:
             raise MemoryWriterError(f"Failed to copy file: {e}")
 
+    def _conflict_timestamp(self) -> str:
+        """Return the conflict suffix stamp, formatting at most once per second"""
+        now = int(time.time())
+        if now != self._stamp_cache[0]:
+            stamp = datetime.fromtimestamp(now).strftime("%Y%m%d_%H%M%S")
+            self._stamp_cache = (now, stamp)
+        return self._stamp_cache[1]
+
     def _enforce_version_retention(self, target_dir: Path, source_file: Path) -> None:
         """Keep only the latest N versions per source file to prevent unbounded growth."""
         if self.max_versions_per_source <= 0:
@@ -98,20 +160,26 @@ class MemoryWriter:
 
         stem = source_file.stem
         suffix = source_file.suffix
-        pattern = f"{stem}*{suffix}"
-        files = sorted(
-            [p for p in target_dir.glob(pattern) if p.is_file()],
-            key=lambda p: p.stat().st_mtime,
-            reverse=True
-        )
-
-        for f in files[self.max_versions_per_source:]:
+        min_len = len(stem) + len(suffix)
+
+        # Single directory pass; DirEntry avoids Path allocation and re-stat
+        with os.scandir(target_dir) as it:
+            candidates = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in it
+                if len(entry.name) >= min_len
+                and entry.name.startswith(stem)
+                and entry.name.endswith(suffix)
+                and entry.is_file()
+            ]
+        candidates.sort(reverse=True)
+
+        for _, path in candidates[self.max_versions_per_source:]:
             try:
-                f.unlink()
-                self.logger.debug(f"Pruned old memory version: {f}")
+                os.unlink(path)
+                self.logger.debug(f"Pruned old memory version: {path}")
             except Exception as e:
-                self.logger.warning(f"Failed to prune memory version {f}: {e}")
-
+                self.logger.warning(f"Failed to prune memory version {path}: {e}")
 
     def write_memory_entry(
         self,
@@ -171,42 +239,136 @@ class MemoryWriter:
         if not file_path.exists():
             raise MemoryWriterError(f"File not found: {file_path}")
 
+        frontmatter = self._build_frontmatter(metadata).encode('utf-8')
+        tmp_path = None
+
         try:
-            # Read existing content
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Remove existing frontmatter if present
-            if content.startswith("---"):
-                parts = content.split("---", 2)
-                if len(parts) >= 3:
-                    content = parts[2].lstrip()
-
-            # Create new frontmatter
-            frontmatter = "---\n"
-            for key, value in metadata.items():
-                # Handle different value types
-                if isinstance(value, str):
-                    frontmatter += f"{key}: {value}\n"
-                elif isinstance(value, (int, float, bool)):
-                    frontmatter += f"{key}: {value}\n"
-                elif isinstance(value, list):
-                    frontmatter += f"{key}:\n"
-                    for item in value:
-                        frontmatter += f"  - {item}\n"
-                else:
-                    frontmatter += f"{key}: {str(value)}\n"
-            frontmatter += "---\n\n"
-
-            # Write new content
-            new_content = frontmatter + content
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(new_content)
+            with open(file_path, 'rb') as src:
+                body_offset = self._frontmatter_end(src)
+                src.seek(body_offset)
+
+                # Stream the body into a sibling temp file, then swap it in
+                with tempfile.NamedTemporaryFile(
+                    dir=file_path.parent, prefix=f".{file_path.name}.",
+                    suffix=".tmp", delete=False
+                ) as tmp:
+                    tmp_path = tmp.name
+                    tmp.write(frontmatter)
+                    shutil.copyfileobj(src, tmp, _COPY_BUFSIZE)
+
+            shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, file_path)
+            tmp_path = None
 
             self.logger.debug(f"Added metadata to: {file_path}")
 
         except Exception as e:
             raise MemoryWriterError(f"Failed to add metadata: {e}")
+        finally:
+            if tmp_path is not None:
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
+
+    def record_metadata(
+        self,
+        file_path: Path,
+        metadata: Dict[str, Any]
+    ) -> None:
+        """
+        Append metadata for a memory file to the JSONL index
+
+        Unlike add_metadata(), the file itself is left untouched. Records
+        are buffered; call flush_index() to make them visible to readers.
+
+        Args:
+            file_path: Path to file in the memory directory
+            metadata: Dictionary of metadata fields
+
+        Raises:
+            MemoryWriterError: If the index cannot be written
+        """
+        try:
+            path = str(Path(file_path).relative_to(self.memory_dir))
+        except ValueError:
+            path = str(file_path)
+        line = _dumps_line({"path": path, **metadata})
+
+        try:
+            with self._index_lock:
+                if self._index_fh is None:
+                    self._index_fh = open(
+                        self.memory_dir / self.INDEX_FILENAME, "ab",
+                        buffering=_INDEX_BUFSIZE,
+                    )
+                self._index_fh.write(line)
+        except Exception as e:
+            raise MemoryWriterError(f"Failed to record metadata: {e}")
+
+    def flush_index(self) -> None:
+        """Write buffered index records to disk"""
+        with self._index_lock:
+            if self._index_fh is not None:
+                self._index_fh.flush()
+
+    def close_index(self) -> None:
+        """Flush and close the metadata index"""
+        with self._index_lock:
+            if self._index_fh is not None:
+                self._index_fh.close()
+                self._index_fh = None
+
+    @staticmethod
+    def _build_frontmatter(metadata: Dict[str, Any]) -> str:
+        """Render metadata as a YAML frontmatter block"""
+        body = yaml.dump(
+            metadata,
+            Dumper=_YAML_DUMPER,
+            default_flow_style=False,
+            sort_keys=False,
+            allow_unicode=True,
+            width=_YAML_WIDTH,
+        )
+        return f"---\n{body}---\n\n"
+
+    @staticmethod
+    def _frontmatter_end(src) -> int:
+        """
+        Locate where the body starts in a binary file handle
+
+        Mirrors the previous split-on-"---" behaviour: the body begins after
+        the second "---" marker, with leading whitespace stripped. Only the
+        head of the file is read.
+
+        Returns:
+            Byte offset of the body (0 when no frontmatter is present)
+        """
+        # Prepend-only fast path: peek three bytes before reading the head
+        head = src.read(3)
+        if head != b"---":
+            return 0
+        head += src.read(_HEAD_CHUNK)
+
+        while True:
+            idx = head.find(b"---", 3)
+            if idx != -1:
+                break
+            more = src.read(_HEAD_CHUNK)
+            if not more:
+                return 0  # Unterminated frontmatter: keep the whole file
+            head += more
+
+        offset = idx + 3
+        src.seek(offset)
+        while True:
+            chunk = src.read(_HEAD_CHUNK)
+            if not chunk:
+                return offset
+            body = chunk.lstrip()
+            offset += len(chunk) - len(body)
+            if body:
+                return offset
 
     def get_category_from_path(self, file_path: Path) -> str:
         """
@@ -218,25 +380,23 @@ class MemoryWriter:
         Returns:
             Category name
         """
-        path_str = str(file_path).lower()
-
-        # Simple rule-based categorization
-        if 'project' in path_str:
-            return 'projects'
-        elif 'note' in path_str:
-            return 'notes'
-        elif 'doc' in path_str or 'document' in path_str:
-            return 'documents'
-        elif 'meeting' in path_str:
-            return 'meetings'
-        else:
-            return 'general'
+        return _category_for_path(str(file_path))
+
+
+@functools.lru_cache(maxsize=4096)
+def _category_for_path(path: str) -> str:
+    """Category for a path string; repeat events for a file hit the cache"""
+    # One scan collects every keyword hit, then priority picks the winner
+    found = set(_CATEGORY_RE.findall(path.lower()))
+    if found:
+        for keyword, category in _CATEGORY_KEYWORDS:
+            if keyword in found:
+                return category
+    return 'general'
 
 
 # Example usage and testing
 if __name__ == "__main__":
-    import tempfile
-
     # Setup logging
     logging.basicConfig(
         level=logging.INFO,
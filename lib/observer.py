@@ -6,22 +6,53 @@ Extracts structured observations from OpenClaw session transcripts
 using configurable LLM providers (OpenAI, Google).
 """
 
+import asyncio
+import codecs
+import functools
+import hashlib
 import json
 import logging
+import mmap
 import os
 import re
+import shutil
+import sys
+import tempfile
+import threading
+from concurrent.futures import Future
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Fallback patterns for JSON embedded in free-form LLM output
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 
 # =============================================================================
 # Data Classes
 # =============================================================================
 
+# Priority -> marker emoji used in markdown output
+PRIORITY_EMOJI = {
+    'high': '\U0001f534',
+    'medium': '\U0001f7e1',
+    'low': '\U0001f7e2',
+}
+DEFAULT_PRIORITY_EMOJI = '\u26aa'
+MARKDOWN_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M"
+
+
 @dataclass
 class Observation:
     """A single extracted observation from conversation logs"""
@@ -34,13 +65,8 @@ class Observation:
 
     def to_markdown(self) -> str:
         """Convert observation to markdown format"""
-        priority_emoji = {
-            'high': '\U0001f534',
-            'medium': '\U0001f7e1',
-            'low': '\U0001f7e2'
-        }
-        emoji = priority_emoji.get(self.priority, '\u26aa')
-        ts = self.timestamp.strftime("%Y-%m-%d %H:%M")
+        emoji = PRIORITY_EMOJI.get(self.priority, DEFAULT_PRIORITY_EMOJI)
+        ts = self.timestamp.strftime(MARKDOWN_TIMESTAMP_FORMAT)
         return f"- {emoji} [{ts}] **{self.category}**: {self.content}"
 
     def to_dict(self) -> Dict[str, Any]:
@@ -55,11 +81,61 @@ class Observation:
         }
 
 
+@dataclass
+class ObservationBatch:
+    """
+    Column-oriented view of a group of observations.
+
+    Consumers that walk one field at a time (markdown rendering, vector
+    store upserts) read parallel lists instead of touching every object.
+    """
+    ids: List[str] = field(default_factory=list)
+    timestamps: List[datetime] = field(default_factory=list)
+    priorities: List[str] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+    contents: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_observations(cls, observations: List[Observation]) -> "ObservationBatch":
+        """Build a batch from Observation objects"""
+        return cls(
+            ids=[obs.id for obs in observations],
+            timestamps=[obs.timestamp for obs in observations],
+            priorities=[obs.priority for obs in observations],
+            categories=[obs.category for obs in observations],
+            contents=[obs.content for obs in observations],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_markdown_lines(self) -> List[str]:
+        """
+        Render every observation as a markdown line.
+
+        Observations from one LLM response share a timestamp, so each
+        distinct timestamp is formatted only once.
+        """
+        ts_cache: Dict[datetime, str] = {}
+        for ts in self.timestamps:
+            if ts not in ts_cache:
+                ts_cache[ts] = ts.strftime(MARKDOWN_TIMESTAMP_FORMAT)
+
+        emoji = PRIORITY_EMOJI.get
+        return [
+            f"- {emoji(priority, DEFAULT_PRIORITY_EMOJI)} [{ts_cache[ts]}] **{category}**: {content}"
+            for ts, priority, category, content in zip(
+                self.timestamps, self.priorities, self.categories, self.contents
+            )
+        ]
+
+
 # =============================================================================
 # Observer System Prompt
 # =============================================================================
 
-OBSERVER_SYSTEM_PROMPT = """You are an Observation Extraction Agent for a memory system.
+# Task and extraction rules shared by the single and batched prompts
+_OBSERVER_RULES = """You are an Observation Extraction Agent for a memory system.
 
 Your task: Analyze conversation messages and extract structured observations.
 
@@ -71,23 +147,59 @@ Your task: Analyze conversation messages and extract structured observations.
 5. Include time context when available
 6. Do NOT include small talk, greetings, or trivial exchanges
 7. Do NOT infer or assume - only extract explicitly stated information
+"""
+
+OBSERVER_SYSTEM_PROMPT = _OBSERVER_RULES + """
+## Output Format
+Return a JSON object with an "observations" array:
+```json
+{
+  "observations": [
+    {
+      "priority": "high|medium|low",
+      "category": "preference|fact|task|decision|constraint",
+      "content": "Clear, concise observation statement",
+      "time_context": "optional time reference from the conversation"
+    }
+  ]
+}
+```
 
+If no meaningful observations can be extracted, return: {"observations": []}
+"""
+
+OBSERVER_BATCH_INSTRUCTIONS = """
 ## Output Format
-Return a JSON array of observations:
+The input contains several independent conversations, each introduced by a
+"## Conversation <id>" heading. Extract observations for each conversation
+separately and return a JSON object whose "by_id" field maps every
+conversation id to its observation array:
 ```json
-[
-  {
-    "priority": "high|medium|low",
-    "category": "preference|fact|task|decision|constraint",
-    "content": "Clear, concise observation statement",
-    "time_context": "optional time reference from the conversation"
+{
+  "by_id": {
+    "1": [
+      {
+        "priority": "high|medium|low",
+        "category": "preference|fact|task|decision|constraint",
+        "content": "Clear, concise observation statement",
+        "time_context": "optional time reference from the conversation"
+      }
+    ],
+    "2": []
   }
-]
+}
 ```
 
-If no meaningful observations can be extracted, return an empty array: []
+Use an empty array for conversations without meaningful observations.
 """
 
+# The single-conversation output format is left out: its {"observations": [...]}
+# shape would contradict the by_id reply the batch parser expects
+OBSERVER_BATCH_SYSTEM_PROMPT = _OBSERVER_RULES + OBSERVER_BATCH_INSTRUCTIONS
+
+# Fixed prompt overhead of a batched request, counted against max_batch_chars
+_BATCH_PROMPT_CHARS = len(OBSERVER_BATCH_SYSTEM_PROMPT)
+
 
 # =============================================================================
 # Observer Agent
@@ -105,6 +217,8 @@ class Observer:
         model: Optional[str] = None,
         api_key: Optional[str] = None,
         api_key_env: str = "OPENAI_API_KEY",
+        batch_window_ms: int = 500,
+        max_batch_chars: int = 60_000,
     ):
         """
         Args:
@@ -112,12 +226,31 @@ class Observer:
             model: Model name (auto-selected if None)
             api_key: API key (reads from env if None)
             api_key_env: Environment variable name for API key
+            batch_window_ms: How long observe_async waits to aggregate
+                             conversations into a single LLM call
+            max_batch_chars: Request size (batch prompt plus pending
+                             conversations) that triggers an immediate flush
         """
         self.provider = provider
         self.model = model or self._default_model(provider)
         self.api_key = api_key or os.environ.get(api_key_env, "")
         self._observation_counter = 0
 
+        # SDK client, built on first use and reused while the key is unchanged
+        self._client = None
+        self._client_key: Optional[str] = None
+        self._aclient = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Request aggregator state for observe_async()
+        self.batch_window = batch_window_ms / 1000.0
+        self.max_batch_chars = max_batch_chars
+        self._pending: List[Tuple[str, Future]] = []
+        self._pending_chars = 0
+        self._pending_lock = threading.Lock()
+        self._batch_lock = threading.Lock()  # only one batch in flight
+        self._batch_timer: Optional[threading.Timer] = None
+
         if not self.api_key:
             logger.warning(
                 f"No API key found. Set {api_key_env} environment variable "
@@ -133,12 +266,17 @@ class Observer:
         }
         return defaults.get(provider, "gpt-4o-mini")
 
-    def observe(self, messages: List[Dict[str, str]]) -> List[Observation]:
+    def observe(
+        self, messages: List[Dict[str, str]], raise_errors: bool = False
+    ) -> List[Observation]:
         """
         Extract observations from conversation messages.
 
         Args:
             messages: List of message dicts with 'role' and 'content' keys
+            raise_errors: Re-raise LLM/transport errors instead of returning
+                          [], so callers can retry or tell a failed call
+                          apart from one that found nothing
 
         Returns:
             List of extracted Observation objects
@@ -152,8 +290,12 @@ class Observer:
 
         # Format messages for the LLM
         conversation_text = self._format_messages(messages)
+        return self._observe_text(conversation_text, raise_errors)
 
-        # Call LLM
+    def _observe_text(
+        self, conversation_text: str, raise_errors: bool = False
+    ) -> List[Observation]:
+        """Run a single extraction call for pre-formatted conversation text"""
         try:
             raw_response = self._call_llm(conversation_text)
             observations = self._parse_response(raw_response)
@@ -161,8 +303,120 @@ class Observer:
             return observations
         except Exception as e:
             logger.error(f"Observation extraction failed: {e}")
+            if raise_errors:
+                raise
             return []
 
+    async def aobserve(
+        self, messages: List[Dict[str, str]], raise_errors: bool = False
+    ) -> List[Observation]:
+        """
+        Async variant of observe() using the providers' async clients.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+            raise_errors: Re-raise LLM/transport errors instead of returning []
+
+        Returns:
+            List of extracted Observation objects
+        """
+        if not messages:
+            return []
+
+        if not self.api_key:
+            logger.error("Cannot observe: no API key configured")
+            return []
+
+        conversation_text = self._format_messages(messages)
+        try:
+            raw_response = await self._acall_llm(conversation_text)
+            observations = self._parse_response(raw_response)
+            logger.info(f"Extracted {len(observations)} observations")
+            return observations
+        except Exception as e:
+            logger.error(f"Observation extraction failed: {e}")
+            if raise_errors:
+                raise
+            return []
+
+    def observe_async(self, messages: List[Dict[str, str]]) -> "Future[List[Observation]]":
+        """
+        Queue messages for batched observation extraction.
+
+        Conversations submitted within the batch window are sent to the LLM
+        in a single request; each caller receives its own observations.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content' keys
+
+        Returns:
+            Future resolving to the extracted Observation objects
+        """
+        future: Future = Future()
+        if not messages or not self.api_key:
+            future.set_result(self.observe(messages))
+            return future
+
+        conversation_text = self._format_messages(messages)
+        with self._pending_lock:
+            self._pending.append((conversation_text, future))
+            self._pending_chars += len(conversation_text)
+            flush_now = (
+                _BATCH_PROMPT_CHARS + self._pending_chars >= self.max_batch_chars
+            )
+            if flush_now:
+                if self._batch_timer is not None:
+                    self._batch_timer.cancel()
+                    self._batch_timer = None
+            elif self._batch_timer is None:
+                self._batch_timer = threading.Timer(self.batch_window, self.flush_batch)
+                self._batch_timer.daemon = True
+                self._batch_timer.start()
+
+        if flush_now:
+            self.flush_batch()
+        return future
+
+    def flush_batch(self) -> None:
+        """Send all pending observe_async() conversations in one LLM call"""
+        with self._batch_lock:
+            with self._pending_lock:
+                if self._batch_timer is not None:
+                    self._batch_timer.cancel()
+                    self._batch_timer = None
+                batch, self._pending = self._pending, []
+                self._pending_chars = 0
+
+            if not batch:
+                return
+
+            if len(batch) == 1:
+                text, future = batch[0]
+                future.set_result(self._observe_text(text))
+                return
+
+            try:
+                blocks = [
+                    f"## Conversation {i}\n{text}"
+                    for i, (text, _) in enumerate(batch, start=1)
+                ]
+                raw_response = self._call_llm(
+                    "\n\n".join(blocks), system_prompt=OBSERVER_BATCH_SYSTEM_PROMPT
+                )
+                by_id = self._parse_batch_response(raw_response)
+            except Exception as e:
+                logger.error(f"Batched observation extraction failed: {e}")
+                by_id = {}
+
+            total = 0
+            for i, (_, future) in enumerate(batch, start=1):
+                observations = self._to_observations(by_id.get(str(i), []))
+                total += len(observations)
+                future.set_result(observations)
+            logger.info(
+                f"Extracted {total} observations from {len(batch)} batched conversations"
+            )
+
     def observe_from_file(self, log_file: Path) -> List[Observation]:
         """
         Extract observations from a JSONL log file.
@@ -185,56 +439,130 @@ class Observer:
             lines.append(f"[{role}]: {content}")
         return "\n\n".join(lines)
 
-    def _call_llm(self, conversation_text: str) -> str:
+    def _call_llm(
+        self, conversation_text: str, system_prompt: str = OBSERVER_SYSTEM_PROMPT
+    ) -> str:
         """
         Call the LLM API to extract observations.
 
         Args:
             conversation_text: Formatted conversation text
+            system_prompt: Instructions sent ahead of the conversation
 
         Returns:
             Raw LLM response string
         """
         if self.provider == "openai":
-            return self._call_openai(conversation_text)
+            return self._call_openai(conversation_text, system_prompt)
         elif self.provider == "google":
-            return self._call_google(conversation_text)
+            return self._call_google(conversation_text, system_prompt)
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
 
-    def _call_openai(self, conversation_text: str) -> str:
-        """Call OpenAI API"""
-        from openai import OpenAI
+    async def _acall_llm(
+        self, conversation_text: str, system_prompt: str = OBSERVER_SYSTEM_PROMPT
+    ) -> str:
+        """Call the LLM API without blocking the event loop"""
+        if self.provider == "openai":
+            return await self._acall_openai(conversation_text, system_prompt)
+        elif self.provider == "google":
+            return await self._acall_google(conversation_text, system_prompt)
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
 
-        client = OpenAI(api_key=self.api_key)
-        response = client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": OBSERVER_SYSTEM_PROMPT},
-                {"role": "user", "content": f"Extract observations from this conversation:\n\n{conversation_text}"},
-            ],
-            temperature=0.1,
-            max_tokens=2000,
-            response_format={"type": "json_object"},
-        )
-        return response.choices[0].message.content or "[]"
+    def _get_client(self):
+        """Return the cached provider client, creating it on first use"""
+        if self._client is not None and self._client_key == self.api_key:
+            return self._client
 
-    def _call_google(self, conversation_text: str) -> str:
-        """Call Google Gemini API"""
-        from google import genai
+        if self.provider == "openai":
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key)
+        else:
+            from google import genai
+            self._client = genai.Client(api_key=self.api_key)
+        self._client_key = self.api_key
+        return self._client
+
+    def _async_client(self):
+        """
+        Async SDK client for the running event loop.
+        Async HTTP pools are bound to the loop that created them, so the
+        client is rebuilt when called from a different loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            if self.provider == "openai":
+                from openai import AsyncOpenAI
+                self._aclient = AsyncOpenAI(api_key=self.api_key)
+            else:
+                from google import genai
+                self._aclient = genai.Client(api_key=self.api_key).aio
+            self._aclient_loop = loop
+        return self._aclient
 
-        client = genai.Client(api_key=self.api_key)
+    def _openai_request(self, conversation_text: str, system_prompt: str) -> Dict[str, Any]:
+        """Keyword arguments for chat.completions.create()"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": f"Extract observations from this conversation:\n\n{conversation_text}"},
+            ],
+            "temperature": 0.1,
+            "max_tokens": 2000,
+            "response_format": {"type": "json_object"},
+        }
 
-        prompt = (
-            f"{OBSERVER_SYSTEM_PROMPT}\n\n"
+    @staticmethod
+    def _google_prompt(conversation_text: str, system_prompt: str) -> str:
+        """Single-turn prompt for Gemini, which takes no system message"""
+        return (
+            f"{system_prompt}\n\n"
             f"Extract observations from this conversation:\n\n"
             f"{conversation_text}\n\n"
-            f"Return ONLY a JSON array."
+            f"Return ONLY the JSON object."
         )
 
+    def _call_openai(
+        self, conversation_text: str, system_prompt: str = OBSERVER_SYSTEM_PROMPT
+    ) -> str:
+        """Call OpenAI API"""
+        client = self._get_client()
+        response = client.chat.completions.create(
+            **self._openai_request(conversation_text, system_prompt)
+        )
+        return response.choices[0].message.content or '{"observations": []}'
+
+    async def _acall_openai(
+        self, conversation_text: str, system_prompt: str = OBSERVER_SYSTEM_PROMPT
+    ) -> str:
+        client = self._async_client()
+        response = await client.chat.completions.create(
+            **self._openai_request(conversation_text, system_prompt)
+        )
+        return response.choices[0].message.content or '{"observations": []}'
+
+    def _call_google(
+        self, conversation_text: str, system_prompt: str = OBSERVER_SYSTEM_PROMPT
+    ) -> str:
+        """Call Google Gemini API"""
+        client = self._get_client()
         response = client.models.generate_content(
             model=self.model,
-            contents=prompt,
+            contents=self._google_prompt(conversation_text, system_prompt),
+            config={"response_mime_type": "application/json"},
+        )
+        return response.text
+
+    async def _acall_google(
+        self, conversation_text: str, system_prompt: str = OBSERVER_SYSTEM_PROMPT
+    ) -> str:
+        client = self._async_client()
+        response = await client.models.generate_content(
+            model=self.model,
+            contents=self._google_prompt(conversation_text, system_prompt),
+            config={"response_mime_type": "application/json"},
         )
         return response.text
 
@@ -250,13 +578,13 @@ class Observer:
         """
         # Try to extract JSON from response
         try:
-            data = json.loads(raw_response)
+            data = _json_loads(raw_response)
         except json.JSONDecodeError:
             # Try to find JSON array in the response
-            match = re.search(r'\[.*\]', raw_response, re.DOTALL)
+            match = _JSON_ARRAY_RE.search(raw_response)
             if match:
                 try:
-                    data = json.loads(match.group())
+                    data = _json_loads(match.group())
                 except json.JSONDecodeError:
                     logger.warning("Failed to parse LLM response as JSON")
                     return []
@@ -264,9 +592,14 @@ class Observer:
                 logger.warning("No JSON array found in LLM response")
                 return []
 
-        # Handle wrapper object (e.g., {"observations": [...]})
+        # Fast path: the documented {"observations": [...]} shape
         if isinstance(data, dict):
-            for key in ('observations', 'results', 'data', 'items'):
+            items = data.get('observations')
+            if isinstance(items, list):
+                return self._to_observations(items)
+
+            # Other wrapper keys some models still use
+            for key in ('results', 'data', 'items'):
                 if key in data and isinstance(data[key], list):
                     data = data[key]
                     break
@@ -274,19 +607,71 @@ class Observer:
                 logger.warning("Unexpected JSON structure")
                 return []
 
+        return self._to_observations(data)
+
+    def _parse_batch_response(self, raw_response: str) -> Dict[str, Any]:
+        """
+        Parse a batched LLM response into a conversation-id -> items map.
+
+        Args:
+            raw_response: Raw LLM response string
+
+        Returns:
+            Dict mapping conversation ids (as strings) to observation items
+
+        Raises:
+            ValueError: If the reply is a JSON object without a 'by_id' map
+        """
+        try:
+            data = _json_loads(raw_response)
+        except json.JSONDecodeError:
+            match = _JSON_OBJECT_RE.search(raw_response)
+            if not match:
+                logger.warning("No JSON object found in batched LLM response")
+                return {}
+            try:
+                data = _json_loads(match.group())
+            except json.JSONDecodeError:
+                logger.warning("Failed to parse batched LLM response as JSON")
+                return {}
+
+        if not isinstance(data, dict):
+            logger.warning("Unexpected JSON structure in batched response")
+            return {}
+
+        # A reply in the single-conversation shape carries no ids to route
+        # by; fail the batch rather than resolve every conversation to []
+        by_id = data.get('by_id')
+        if not isinstance(by_id, dict):
+            raise ValueError(
+                f"Batched response has no 'by_id' map (keys: {sorted(data)[:5]})"
+            )
+        return {str(k): v for k, v in by_id.items()}
+
+    def _to_observations(self, data: Any) -> List[Observation]:
+        """
+        Convert parsed observation items into Observation objects.
+
+        Args:
+            data: List of observation dicts from the LLM
+
+        Returns:
+            List of Observation objects
+        """
         if not isinstance(data, list):
             return []
 
         # Convert to Observation objects
         observations = []
         now = datetime.now()
+        date_prefix = now.strftime('%Y%m%d')
 
         for item in data:
             if not isinstance(item, dict):
                 continue
 
             self._observation_counter += 1
-            obs_id = f"obs_{now.strftime('%Y%m%d')}_{self._observation_counter:04d}"
+            obs_id = f"obs_{date_prefix}_{self._observation_counter:04d}"
 
             # Validate priority
             priority = item.get('priority', 'medium').lower()
@@ -331,20 +716,20 @@ class Observer:
         """
         messages = []
         try:
-            with open(log_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        entry = json.loads(line)
-                        if 'role' in entry and 'content' in entry:
+            with open(log_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return messages  # mmap cannot map an empty file
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for line in iter(mm.readline, b''):
+                        try:
+                            entry = _json_loads(line)
                             messages.append({
                                 'role': entry['role'],
                                 'content': entry['content'],
                             })
-                    except json.JSONDecodeError:
-                        continue
+                        except (ValueError, KeyError, TypeError):
+                            # Blank, malformed, or non-message lines
+                            continue
         except FileNotFoundError:
             logger.error(f"Log file not found: {log_file}")
         except Exception as e:
@@ -376,6 +761,8 @@ def create_observer(config: Dict[str, Any]) -> Observer:
         provider=provider,
         model=model,
         api_key_env=api_key_env,
+        batch_window_ms=int(llm_config.get('batch_window_ms', 500)),
+        max_batch_chars=int(llm_config.get('max_batch_chars', 60_000)),
     )
 
 
@@ -383,13 +770,148 @@ def create_observer(config: Dict[str, Any]) -> Observer:
 # CLI Entry Point: compress subcommand
 # =============================================================================
 
+# Model-name prefixes of the providers the Reflector can call
+_PROVIDER_PREFIXES = (
+    ("gemini", "google"),
+    ("gpt", "openai"),
+)
+
+
+@functools.lru_cache(maxsize=128)
 def _detect_provider(model: str) -> str:
-    """Detect LLM provider from model name"""
-    if model.startswith("gemini"):
-        return "google"
+    """Detect LLM provider from model name (defaults to openai)"""
+    for prefix, provider in _PROVIDER_PREFIXES:
+        if model.startswith(prefix):
+            return provider
     return "openai"
 
 
+def _hash_sidecar(path: Path) -> Path:
+    """Sidecar file recording the digest of the last compressed content"""
+    return path.with_name(path.name + ".oc_hash")
+
+
+def _read_sidecar(path: Path) -> Tuple[Optional[str], Optional[Tuple[int, int]]]:
+    """
+    Read a compress sidecar.
+
+    Returns:
+        (digest, (mtime_ns, size)) of the file as last written; either part
+        is None when missing
+    """
+    try:
+        fields = _hash_sidecar(path).read_text(encoding='utf-8').split()
+    except OSError:
+        return None, None
+    if not fields:
+        return None, None
+    if len(fields) == 3 and fields[1].isdigit() and fields[2].isdigit():
+        return fields[0], (int(fields[1]), int(fields[2]))
+    return fields[0], None
+
+
+def _write_sidecar(path: Path, data: bytes) -> None:
+    """Record the digest and stat signature of freshly written content"""
+    st = path.stat()
+    _hash_sidecar(path).write_text(
+        f"{_content_digest(data)} {st.st_mtime_ns} {st.st_size}\n", encoding='utf-8'
+    )
+
+
+def _content_digest(data) -> str:
+    """Short digest of raw file bytes (any buffer, e.g. an mmap)"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    Replace a file's contents in one rename so watchers never see a
+    partially written file.
+    """
+    tmp_path = None
+    try:
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp_path = tmp.name
+            tmp.write(data)
+        shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+        tmp_path = None
+    finally:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+async def _compress_chunk(
+    reflector, chunk: List[Tuple[Path, str, int]], level: int
+) -> int:
+    """
+    Compress one chunk of target files and write back the improved ones.
+
+    Returns:
+        Number of files successfully compressed
+    """
+    results = await reflector.areflect_batch(
+        [(str(i), content) for i, (_, content, _) in enumerate(chunk)],
+        level=level,
+    )
+
+    loop = asyncio.get_running_loop()
+    success_count = 0
+    for i, (path, _, _) in enumerate(chunk):
+        result = results[str(i)]
+        if result.compression_ratio > 1.0:
+            # Keep file I/O off the event loop
+            try:
+                await loop.run_in_executor(
+                    None, _write_compressed, path, result.compressed_content
+                )
+            except OSError as e:
+                logger.error("  → %s: failed to write compressed file: %s", path.name, e)
+                continue
+            logger.info(
+                "  → %s: %d → %d tokens (%.1fx compression)",
+                path.name, result.original_tokens, result.compressed_tokens,
+                result.compression_ratio,
+            )
+            success_count += 1
+        else:
+            logger.warning("  → %s: compression ineffective, file unchanged", path.name)
+    return success_count
+
+
+def _write_compressed(path: Path, content: str) -> None:
+    """Atomically write compressed content and refresh its sidecar"""
+    data = content.encode('utf-8')
+    _atomic_write(path, data)
+    _write_sidecar(path, data)
+
+
+async def _compress_chunks(
+    reflector, chunks: List[Tuple[int, List[Tuple[Path, str, int]]]], max_concurrency: int
+) -> int:
+    """Run every chunk on one event loop with at most max_concurrency calls in flight"""
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run_one(level: int, chunk: List[Tuple[Path, str, int]]) -> int:
+        # A failed chunk is reported and skipped; the other chunks keep
+        # running and their files are still written
+        async with semaphore:
+            try:
+                return await _compress_chunk(reflector, chunk, level)
+            except Exception as e:
+                names = ", ".join(path.name for path, _, _ in chunk)
+                logger.error("Compression failed for %s: %s", names, e)
+                return 0
+
+    counts = await asyncio.gather(*(run_one(level, chunk) for level, chunk in chunks))
+    return sum(counts)
+
+
 def _run_compress(args) -> int:
     """
     Run compress subcommand.
@@ -404,7 +926,7 @@ def _run_compress(args) -> int:
     api_key = os.environ.get("LLM_API_KEY", "")
 
     if not api_key:
-        print("Error: LLM_API_KEY environment variable not set", file=__import__('sys').stderr)
+        logger.error("LLM_API_KEY environment variable not set")
         return 1
 
     reflector = Reflector(
@@ -414,10 +936,21 @@ def _run_compress(args) -> int:
     )
 
     compression_target = args.compression_target
+    batch_tokens = getattr(args, 'batch_tokens', 8000)
+    min_bytes = getattr(args, 'min_bytes', 2048)
     success_count = 0
 
-    for target_path in args.target:
-        path = Path(target_path).expanduser().resolve()
+    # First pass: read targets and pick a compression level for each
+    from lib.memory_merger import estimate_tokens
+    pending: Dict[int, List[Tuple[Path, str, int]]] = {}
+
+    # Resolve each target once; repeated targets would otherwise be
+    # compressed twice, concurrently
+    from lib.config import resolve_path
+    targets = list(dict.fromkeys(resolve_path(t) for t in args.target))
+
+    for target in targets:
+        path = Path(target)
         if not path.exists():
             # Auto-create active_memory.md if it's the memory file
             if path.name == "active_memory.md":
@@ -425,50 +958,101 @@ def _run_compress(args) -> int:
                     from lib.memory_merger import MemoryMerger
                     merger = MemoryMerger(str(path.parent))
                     merger.save(merger.load())
-                    print(f"Created initial memory file: {path}")
+                    logger.info("Created initial memory file: %s", path)
                 except Exception as e:
-                    print(f"Warning: could not create {path}: {e}", file=__import__('sys').stderr)
+                    logger.warning("Could not create %s: %s", path, e)
                     continue
             else:
-                print(f"Warning: target file not found, skipping: {path}", file=__import__('sys').stderr)
+                logger.warning("Target file not found, skipping: %s", path)
                 continue
 
-        content = path.read_text(encoding='utf-8')
+        # A target ratio >= 1 always yields level 0; decide without reading
+        if compression_target >= 1:
+            logger.info("No compression needed for %s (target ratio %s)", path.name, compression_target)
+            success_count += 1
+            continue
+
+        # Size, signature and content all come from the one open fd, so a
+        # file truncated after the existence check is seen as empty here
+        # instead of failing in mmap
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if st.st_size == 0:
+                logger.warning("Skipping empty file: %s", path)
+                continue
+
+            # Too small for compression to pay for an LLM round trip
+            if st.st_size < min_bytes:
+                logger.info("No compression needed for %s (%d bytes)", path.name, st.st_size)
+                success_count += 1
+                continue
+
+            # Unchanged since this tool last compressed it: an identical stat
+            # signature skips the read and token estimate entirely, and the
+            # digest catches files that were only touched
+            last_digest, last_signature = _read_sidecar(path)
+            if last_signature == (st.st_mtime_ns, st.st_size):
+                logger.info("Unchanged since last compression, skipping: %s", path.name)
+                success_count += 1
+                continue
+
+            # Hash and decode straight from the page cache: an unchanged file
+            # is never decoded, and a changed one is decoded without an extra
+            # bytes copy
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # emptied since the fstat above
+                logger.warning("Skipping empty file: %s", path)
+                continue
+            with mm:
+                if last_digest is not None and last_digest == _content_digest(mm):
+                    logger.info("Unchanged since last compression, skipping: %s", path.name)
+                    success_count += 1
+                    continue
+                # final=True raises on a truncated sequence at EOF, and
+                # newlines are translated as read_text() would
+                content = codecs.utf_8_decode(mm, 'strict', True)[0]
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+
         if not content.strip():
-            print(f"Skipping empty file: {path}", file=__import__('sys').stderr)
+            logger.warning("Skipping empty file: %s", path)
             continue
 
         # Determine compression level from target ratio
-        from lib.memory_merger import estimate_tokens
         token_count = estimate_tokens(content)
         target_tokens = int(token_count * compression_target)
         level = reflector.suggest_level(token_count, target_tokens)
 
         if level == 0:
-            print(f"No compression needed for {path.name} ({token_count} tokens)")
+            logger.info("No compression needed for %s (%d tokens)", path.name, token_count)
             success_count += 1
             continue
 
-        print(f"Compressing {path.name}: {token_count} tokens, level {level}")
-
-        result = reflector.reflect(content, level=level)
-
-        if result.compression_ratio > 1.0:
-            path.write_text(result.compressed_content, encoding='utf-8')
-            print(
-                f"  → {result.original_tokens} → {result.compressed_tokens} tokens "
-                f"({result.compression_ratio:.1f}x compression)"
-            )
-            success_count += 1
-        else:
-            print(f"  → Compression ineffective, file unchanged", file=__import__('sys').stderr)
+        logger.info("Compressing %s: %d tokens, level %d", path.name, token_count, level)
+        pending.setdefault(level, []).append((path, content, token_count))
+
+    # Second pass: one LLM call per same-level chunk under the token budget
+    chunks: List[Tuple[int, List[Tuple[Path, str, int]]]] = []
+    for level, entries in pending.items():
+        chunk_tokens = 0
+        for entry in entries:
+            if not chunks or chunks[-1][0] != level or chunk_tokens + entry[2] > batch_tokens:
+                chunks.append((level, []))
+                chunk_tokens = 0
+            chunks[-1][1].append(entry)
+            chunk_tokens += entry[2]
+
+    # Chunks are independent network calls, so overlap them on one loop
+    if chunks:
+        success_count += asyncio.run(
+            _compress_chunks(reflector, chunks, getattr(args, 'max_concurrency', 4))
+        )
 
     return 0 if success_count > 0 else 1
 
 
 if __name__ == "__main__":
     import argparse
-    import sys
 
     parser = argparse.ArgumentParser(prog="lib.observer", description="OC-Memory Observer CLI")
     subparsers = parser.add_subparsers(dest="command")
@@ -487,9 +1071,24 @@ if __name__ == "__main__":
         "--compression-target", type=float, default=0.5,
         help="Target compression ratio, e.g. 0.5 = 50%% (default: 0.5)",
     )
+    compress_parser.add_argument(
+        "--batch-tokens", type=int, default=8000,
+        help="Max estimated tokens of files sent in one LLM call (default: 8000)",
+    )
+    compress_parser.add_argument(
+        "--min-bytes", type=int, default=2048,
+        help="Leave files smaller than this untouched (default: 2048)",
+    )
+    compress_parser.add_argument(
+        "--max-concurrency", type=int, default=4,
+        help="Max LLM calls in flight at once (default: 4)",
+    )
 
     args = parser.parse_args()
 
+    # CLI progress goes to stderr through the same loggers the daemon uses
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
     if args.command == "compress":
         sys.exit(_run_compress(args))
     else:
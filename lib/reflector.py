@@ -6,12 +6,14 @@ Compresses observations to reduce token usage while
 preserving key information.
 """
 
+import asyncio
 import json
 import logging
 import os
+import re
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,20 @@ Return compressed observations as a markdown list:
 - [priority_emoji] [category]: compressed observation
 """
 
+REFLECTOR_BATCH_INSTRUCTIONS = """
+## Batch Mode
+The input contains several independent files, each wrapped as:
+<<FILE id=ID>>
+...observations...
+<<END>>
+Compress each file separately and never merge content across files.
+Return every file in the same wrapper with its original id.
+"""
+
+REFLECTOR_BATCH_SYSTEM_PROMPT = REFLECTOR_SYSTEM_PROMPT + REFLECTOR_BATCH_INSTRUCTIONS
+
+_FILE_BLOCK_RE = re.compile(r'<<FILE id=([^>]+)>>\n?(.*?)<<END>>', re.DOTALL)
+
 
 # =============================================================================
 # Reflector Agent
@@ -79,6 +95,8 @@ class Reflector:
         self.model = model or self._default_model(provider)
         self.api_key = api_key or os.environ.get(api_key_env, "")
         self.history: List[ReflectionResult] = []
+        self._aclient = None
+        self._aclient_loop: Optional[asyncio.AbstractEventLoop] = None
 
     @staticmethod
     def _default_model(provider: str) -> str:
@@ -108,46 +126,98 @@ class Reflector:
 
         if not self.api_key:
             logger.error("Cannot reflect: no API key configured")
-            return ReflectionResult(
-                original_tokens=original_tokens,
-                compressed_tokens=original_tokens,
-                compression_ratio=1.0,
-                compressed_content=observations_text,
-                level=level,
-                timestamp=datetime.now(),
-            )
+            return self._unchanged(observations_text, original_tokens, level)
 
         try:
             compressed = self._call_llm(observations_text, level)
-            compressed_tokens = self._estimate_tokens(compressed)
-            ratio = original_tokens / max(compressed_tokens, 1)
-
-            result = ReflectionResult(
-                original_tokens=original_tokens,
-                compressed_tokens=compressed_tokens,
-                compression_ratio=round(ratio, 1),
-                compressed_content=compressed,
-                level=level,
-                timestamp=datetime.now(),
-            )
+            return self._record(original_tokens, compressed, level)
 
-            self.history.append(result)
-            logger.info(
-                f"Compression: {original_tokens} -> {compressed_tokens} tokens "
-                f"({ratio:.1f}x at level {level})"
-            )
-            return result
+        except Exception as e:
+            logger.error(f"Reflection failed: {e}")
+            return self._unchanged(observations_text, original_tokens, level)
+
+    async def areflect(
+        self,
+        observations_text: str,
+        level: int = 1,
+    ) -> ReflectionResult:
+        """
+        Async variant of reflect() using the providers' async clients.
+
+        Args:
+            observations_text: Raw observations markdown text
+            level: Compression level (1=light, 2=medium, 3=heavy)
+
+        Returns:
+            ReflectionResult with compressed content
+        """
+        level = max(1, min(3, level))
+        original_tokens = self._estimate_tokens(observations_text)
+
+        if not self.api_key:
+            logger.error("Cannot reflect: no API key configured")
+            return self._unchanged(observations_text, original_tokens, level)
+
+        try:
+            compressed = await self._acall_llm(observations_text, level)
+            return self._record(original_tokens, compressed, level)
 
         except Exception as e:
             logger.error(f"Reflection failed: {e}")
-            return ReflectionResult(
-                original_tokens=original_tokens,
-                compressed_tokens=original_tokens,
-                compression_ratio=1.0,
-                compressed_content=observations_text,
-                level=level,
-                timestamp=datetime.now(),
+            return self._unchanged(observations_text, original_tokens, level)
+
+    async def areflect_batch(
+        self,
+        items: List[Tuple[str, str]],
+        level: int = 1,
+    ) -> Dict[str, ReflectionResult]:
+        """
+        Compress several observation texts with a single LLM call.
+
+        Texts are wrapped in <<FILE id=...>> / <<END>> markers and the model
+        answers with the same markers. Items missing from the response are
+        compressed individually through areflect(), concurrently.
+
+        Args:
+            items: (id, observations_text) pairs
+            level: Compression level applied to every item
+
+        Returns:
+            Dict mapping item ids to ReflectionResult
+        """
+        if len(items) <= 1 or not self.api_key:
+            results = await asyncio.gather(
+                *(self.areflect(text, level) for _, text in items)
+            )
+            return {item_id: result for (item_id, _), result in zip(items, results)}
+
+        level = max(1, min(3, level))
+        try:
+            raw_response = await self._acall_llm(
+                self._batch_input(items), level,
+                system_prompt=REFLECTOR_BATCH_SYSTEM_PROMPT,
             )
+            compressed = self._split_batch(raw_response)
+        except Exception as e:
+            logger.error(f"Batched reflection failed: {e}")
+            compressed = {}
+
+        results = {}
+        missing = []
+        for item_id, text in items:
+            content = compressed.get(item_id)
+            if content:
+                results[item_id] = self._record(
+                    self._estimate_tokens(text), content, level
+                )
+            else:
+                logger.warning(f"No batched output for {item_id}, compressing alone")
+                missing.append((item_id, text))
+
+        retried = await asyncio.gather(*(self.areflect(text, level) for _, text in missing))
+        for (item_id, _), result in zip(missing, retried):
+            results[item_id] = result
+        return results
 
     def should_reflect(self, token_count: int, threshold: int = 40000) -> bool:
         """Check if compression is needed based on token count"""
@@ -185,14 +255,70 @@ class Reflector:
             'average_ratio': round(avg_ratio, 1),
         }
 
-    def _call_llm(self, text: str, level: int) -> str:
-        """Call LLM for compression"""
-        prompt = (
-            f"{REFLECTOR_SYSTEM_PROMPT}\n\n"
+    @staticmethod
+    def _unchanged(text: str, original_tokens: int, level: int) -> ReflectionResult:
+        """Result for text that was left uncompressed"""
+        return ReflectionResult(
+            original_tokens=original_tokens,
+            compressed_tokens=original_tokens,
+            compression_ratio=1.0,
+            compressed_content=text,
+            level=level,
+            timestamp=datetime.now(),
+        )
+
+    @staticmethod
+    def _batch_input(items: List[Tuple[str, str]]) -> str:
+        """Wrap texts in the batch-mode file markers"""
+        return "\n".join(
+            f"<<FILE id={item_id}>>\n{text}\n<<END>>" for item_id, text in items
+        )
+
+    @staticmethod
+    def _split_batch(raw_response: str) -> Dict[str, str]:
+        """Split a batch-mode response back into id -> compressed text"""
+        return {
+            m.group(1).strip(): m.group(2).strip()
+            for m in _FILE_BLOCK_RE.finditer(raw_response)
+        }
+
+    def _record(
+        self, original_tokens: int, compressed: str, level: int
+    ) -> ReflectionResult:
+        """Build a ReflectionResult for compressed output and log it"""
+        compressed_tokens = self._estimate_tokens(compressed)
+        ratio = original_tokens / max(compressed_tokens, 1)
+
+        result = ReflectionResult(
+            original_tokens=original_tokens,
+            compressed_tokens=compressed_tokens,
+            compression_ratio=round(ratio, 1),
+            compressed_content=compressed,
+            level=level,
+            timestamp=datetime.now(),
+        )
+
+        self.history.append(result)
+        logger.info(
+            f"Compression: {original_tokens} -> {compressed_tokens} tokens "
+            f"({ratio:.1f}x at level {level})"
+        )
+        return result
+
+    @staticmethod
+    def _build_prompt(text: str, level: int, system_prompt: str) -> str:
+        return (
+            f"{system_prompt}\n\n"
             f"Compression Level: {level}\n\n"
             f"Compress these observations:\n\n{text}"
         )
 
+    def _call_llm(
+        self, text: str, level: int, system_prompt: str = REFLECTOR_SYSTEM_PROMPT
+    ) -> str:
+        """Call LLM for compression"""
+        prompt = self._build_prompt(text, level, system_prompt)
+
         if self.provider == "openai":
             return self._call_openai(prompt)
         elif self.provider == "google":
@@ -200,17 +326,64 @@ class Reflector:
         else:
             raise ValueError(f"Unsupported provider: {self.provider}")
 
+    async def _acall_llm(
+        self, text: str, level: int, system_prompt: str = REFLECTOR_SYSTEM_PROMPT
+    ) -> str:
+        """Call LLM for compression without blocking the event loop"""
+        prompt = self._build_prompt(text, level, system_prompt)
+
+        if self.provider == "openai":
+            return await self._acall_openai(prompt)
+        elif self.provider == "google":
+            return await self._acall_google(prompt)
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+
+    def _async_client(self):
+        """
+        Async SDK client for the running event loop.
+        Async HTTP pools are bound to the loop that created them, so the
+        client is rebuilt when called from a different loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aclient is None or self._aclient_loop is not loop:
+            if self.provider == "openai":
+                from openai import AsyncOpenAI
+                self._aclient = AsyncOpenAI(api_key=self.api_key)
+            else:
+                from google import genai
+                self._aclient = genai.Client(api_key=self.api_key).aio
+            self._aclient_loop = loop
+        return self._aclient
+
+    def _openai_request(self, prompt: str) -> Dict[str, Any]:
+        """Keyword arguments for chat.completions.create()"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are a memory compression agent."},
+                {"role": "user", "content": prompt},
+            ],
+            "temperature": 0.1,
+            "max_tokens": 4000,
+        }
+
+    def _google_request(self, prompt: str) -> Dict[str, Any]:
+        """Keyword arguments for models.generate_content()"""
+        return {"model": self.model, "contents": prompt}
+
     def _call_openai(self, prompt: str) -> str:
         from openai import OpenAI
         client = OpenAI(api_key=self.api_key)
         response = client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "You are a memory compression agent."},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.1,
-            max_tokens=4000,
+            **self._openai_request(prompt)
+        )
+        return response.choices[0].message.content or ""
+
+    async def _acall_openai(self, prompt: str) -> str:
+        client = self._async_client()
+        response = await client.chat.completions.create(
+            **self._openai_request(prompt)
         )
         return response.choices[0].message.content or ""
 
@@ -218,8 +391,14 @@ class Reflector:
         from google import genai
         client = genai.Client(api_key=self.api_key)
         response = client.models.generate_content(
-            model=self.model,
-            contents=prompt,
+            **self._google_request(prompt)
+        )
+        return response.text
+
+    async def _acall_google(self, prompt: str) -> str:
+        client = self._async_client()
+        response = await client.models.generate_content(
+            **self._google_request(prompt)
         )
         return response.text
 
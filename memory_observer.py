@@ -9,27 +9,83 @@ Usage:
 """
 
 import argparse
+import asyncio
+import atexit
+import hashlib
 import logging
+import logging.handlers
+import os
+import queue
+import re
+import sched
+import shutil
 import signal
 import sys
 import time
 import threading
 import json
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait as wait_futures
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, List
 
 from lib import __version__
 from lib.config import get_config, ConfigError
-from lib.file_watcher import FileWatcher
-from lib.memory_writer import MemoryWriter, MemoryWriterError
-from lib.observer import Observer, create_observer
-from lib.memory_merger import MemoryMerger, create_merger
-from lib.reflector import Reflector, create_reflector
-from lib.ttl_manager import TTLManager, create_ttl_manager
-from lib.obsidian_client import ObsidianClient, create_obsidian_client
-from lib.dropbox_sync import DropboxSync, create_dropbox_sync
-from lib.error_handler import LLMRetryPolicy
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; stdlib json is the fallback
+    orjson = None
+    _json_loads = json.loads
+
+_BANNER = "=" * 60
+
+# Words compared by the active-memory topic check
+_WORD_RE = re.compile(r"\w+")
+
+
+def _overlapping_chunks(text: str, size: int, overlap: int) -> List[str]:
+    """Split text into windows of at most size chars sharing overlap chars.
+
+    Windows end on a line break when one falls in the back part of the
+    window, so a note's lines are not cut in half.
+    """
+    chunks = []
+    start = 0
+    while True:
+        end = min(start + size, len(text))
+        if end < len(text):
+            cut = text.rfind('\n', start + overlap + 1, end)
+            if cut != -1:
+                end = cut + 1
+        chunks.append(text[start:end])
+        if end >= len(text):
+            return chunks
+        start = end - overlap
+
+
+def _dedupe_observations(results) -> list:
+    """Flatten per-chunk observation lists, dropping repeats from overlaps."""
+    seen = set()
+    merged = []
+    for observations in results:
+        for obs in observations or ():
+            key = (obs.category, " ".join(obs.content.lower().split()))
+            if key not in seen:
+                seen.add(key)
+                merged.append(obs)
+    return merged
+
+
+# Engine modules (watchdog, LLM clients, sync backends) are imported when
+# the daemon is constructed, so --help and --version stay fast
+if TYPE_CHECKING:
+    from lib.observer import Observer
+    from lib.reflector import Reflector
+    from lib.obsidian_client import ObsidianClient
+    from lib.dropbox_sync import DropboxSync
 
 
 class MemoryObserver:
@@ -50,8 +106,35 @@ class MemoryObserver:
     OBSIDIAN_SYNC_INTERVAL = 3600    # 1 hour
     DROPBOX_SYNC_INTERVAL = 21600    # 6 hours
     COLD_ARCHIVE_CHECK_INTERVAL = 3600  # 1 hour
+    STATS_LOG_INTERVAL = 60          # 1 minute
+    OBS_FLUSH_INTERVAL = 10          # 10 seconds
+    INDEX_FLUSH_INTERVAL = 1         # 1 second
+
+    # Observations buffered before a single MemoryStore write
+    OBS_BUFFER_SIZE = 100
+
+    # Large notes are sent to the Observer as overlapping windows (chars)
+    EXTRACT_CHUNK_CHARS = 32_768
+    EXTRACT_CHUNK_OVERLAP = 2_048
+
+    # Identical content is not re-sent to the LLM within this window
+    CONTENT_HASH_TTL = 3600
+    CONTENT_HASH_MAX = 10_000
+
+    # Per-file sync signatures, kept in memory_dir across restarts
+    OBSIDIAN_SYNC_STATE_FILE = '.obsidian_sync_state.json'
+    OBSIDIAN_SYNC_WORKERS = 8
+
+    # File types on_file_change knows how to process
+    HANDLED_SUFFIXES = frozenset({'.md', '.markdown', '.jsonl'})
 
     def __init__(self, config_path: str = "config.yaml"):
+        from lib.file_watcher import FileWatcher
+        from lib.memory_writer import MemoryWriter
+        from lib.memory_merger import create_merger
+        from lib.ttl_manager import create_ttl_manager
+        from lib.error_handler import LLMRetryPolicy
+
         self.config_path = config_path
         self.logger = logging.getLogger(__name__)
 
@@ -65,58 +148,104 @@ class MemoryObserver:
 
         # --- Core components (always initialized) ---
         watch_cfg = self.config.get('watch', {})
-        self.watch_debounce_seconds = float(watch_cfg.get('debounce_seconds', 2.5))
+        # Bursts of events per file are coalesced by FileWatcher into one
+        # trailing callback, so the drop-based debounce below is opt-in
+        self.watch_debounce_ms = int(watch_cfg.get('debounce_ms', watch_cfg.get('batch_window_ms', 250)))
+        self.watch_debounce_seconds = float(watch_cfg.get('debounce_seconds', 0))
         self.max_versions_per_source = int(watch_cfg.get('max_versions_per_source', 5))
         self.max_file_size = int(self.config.get('memory', {}).get('max_file_size', 10 * 1024 * 1024))
+        self.auto_categorize = bool(self.config['memory'].get('auto_categorize', True))
+        # Metadata goes to memory_dir/.index.jsonl unless frontmatter is requested
+        self.metadata_index = bool(self.config.get('memory', {}).get('metadata_index', True))
 
         self.memory_writer = MemoryWriter(
             memory_dir=self.config['memory']['dir'],
             max_versions_per_source=self.max_versions_per_source
         )
+        # Resolved once; every memory path below derives from it
+        self._memory_dir: Path = self.memory_writer.memory_dir
 
         self._last_event_ts: Dict[str, float] = {}
         self._last_signature: Dict[str, tuple] = {}
+        # Explicit leaf directories replace recursive watching entirely
+        leaves = watch_cfg.get('leaves')
         self.file_watcher = FileWatcher(
-            watch_dirs=self.config['watch']['dirs'],
+            watch_dirs=leaves or self.config['watch']['dirs'],
             callback=self.on_file_change,
-            recursive=self.config['watch'].get('recursive', True)
+            recursive=False if leaves else self.config['watch'].get('recursive', True),
+            leaf_only=bool(watch_cfg.get('leaf_only', False)),
+            batch_window_ms=self.watch_debounce_ms,
+            max_batch=int(watch_cfg.get('max_batch', 64)),
+            # on_file_change appends to active_memory.md; keep it serialized
+            callback_workers=int(watch_cfg.get('callback_workers', 1)),
+            max_pending=int(watch_cfg.get('max_pending', 10_000)),
+            use_polling=bool(watch_cfg.get('use_polling', False)),
+            poll_interval=float(watch_cfg.get('poll_interval', 30)),
+            patterns=watch_cfg.get('patterns') or None
         )
 
         self.merger = create_merger(self.config)
+        self._active_memory_path: Path = self.merger.get_memory_file()
 
         self.ttl_manager = create_ttl_manager(self.config)
 
         # --- Optional LLM components (need API key) ---
-        self.observer: Optional[Observer] = None
-        self.reflector: Optional[Reflector] = None
+        self.observer: Optional['Observer'] = None
+        self.reflector: Optional['Reflector'] = None
         self._init_llm_components()
 
         # --- Optional Obsidian/Dropbox (Cold storage) ---
-        self.obsidian_client: Optional[ObsidianClient] = None
-        self.dropbox_sync: Optional[DropboxSync] = None
+        self.obsidian_client: Optional['ObsidianClient'] = None
+        self.dropbox_sync: Optional['DropboxSync'] = None
         self._init_obsidian()
         self._init_dropbox()
+        # OC-Memory folder inside the vault (Hot/archive/cold subfolders)
+        self._obsidian_base: Optional[Path] = (
+            self.obsidian_client.vault_path / self.obsidian_client.default_folder
+            if self.obsidian_client else None
+        )
+
+        # source path -> [mtime_ns, size, blake2b hex] of the last Obsidian copy
+        self._obsidian_sync_state: Dict[str, list] = {}
+        self._obsidian_sync_executor: Optional[ThreadPoolExecutor] = None
+        if self.obsidian_client:
+            self._load_obsidian_sync_state()
+
+        # Remote syncs run off the scheduler thread, one slot per sink
+        self._sync_pool: Optional[ThreadPoolExecutor] = None
+        self._sync_locks = {'obsidian': threading.Lock(), 'dropbox': threading.Lock()}
 
         # --- Optional vector store (needs chromadb) ---
         self.memory_store = None
         self._init_memory_store()
 
+        # Observations waiting for one batched vector store upsert
+        self._obs_buffer: List[Any] = []
+        self._obs_buffer_lock = threading.Lock()
+        self._store_write_lock = threading.Lock()
+
+        # Event loop thread running concurrent LLM extractions (see start())
+        self.llm_max_concurrency = int(self.config.get('llm', {}).get('max_concurrency', 20))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._llm_semaphore: Optional[asyncio.Semaphore] = None
+        self._merge_executor: Optional[ThreadPoolExecutor] = None
+        self._pending_extractions: set = set()
+
         # --- Retry policy for LLM calls ---
         self.retry_policy = LLMRetryPolicy(
-            max_attempts=3, base_delay=2.0, max_delay=30.0
+            max_attempts=3, base_delay=2.0, max_delay=30.0, jitter=1.0
         )
 
         # --- State ---
         self.running = False
+        self._stop_event = threading.Event()
         self.files_processed = 0
         self.observations_extracted = 0
         self.compressions_run = 0
         self.errors = 0
-        self._last_ttl_check = 0.0
-        self._last_compression_check = 0.0
-        self._last_obsidian_sync = 0.0
-        self._last_dropbox_sync = 0.0
-        self._last_cold_archive_check = 0.0
+        self._scheduler = sched.scheduler(time.monotonic, self._stop_event.wait)
+        self._last_stats: tuple = ()
 
         # Cold archive runtime state
         cold_cfg = self.config.get('cold_memory', {})
@@ -125,9 +254,26 @@ class MemoryObserver:
         self.cold_archives_run = 0
         self.cold_archives_failed = 0
 
+        # Word set of active_memory.md keyed by (mtime_ns, size), for topic checks
+        self._active_memory_cache: Optional[tuple] = None
+
+        # blake2b digest -> monotonic time of content already sent for extraction
+        self._content_hashes: 'OrderedDict[bytes, float]' = OrderedDict()
+        self._content_hash_lock = threading.Lock()
+
         # Track lightweight fallback notes already written to active_memory
         self._fallback_logged: Dict[str, float] = {}
 
+        # Frontmatter written for every synced file; key order is preserved
+        # in the output, constant values are filled in once
+        self._metadata_template: Dict[str, Any] = {
+            "source": None,
+            "synced_at": None,
+            "category": None,
+            "event_type": None,
+            "oc_memory_version": __version__,
+        }
+
     def _init_llm_components(self):
         """Initialize Observer and Reflector if LLM config is present."""
         llm_config = self.config.get('llm', {})
@@ -136,6 +282,9 @@ class MemoryObserver:
             return
 
         try:
+            from lib.observer import create_observer
+            from lib.reflector import create_reflector
+
             self.observer = create_observer(self.config)
             self.reflector = create_reflector(self.config)
             if self.observer.api_key:
@@ -166,6 +315,7 @@ class MemoryObserver:
     def _init_obsidian(self):
         """Initialize ObsidianClient if configured."""
         try:
+            from lib.obsidian_client import create_obsidian_client
             self.obsidian_client = create_obsidian_client(self.config)
             if self.obsidian_client:
                 self.logger.info(
@@ -177,6 +327,7 @@ class MemoryObserver:
     def _init_dropbox(self):
         """Initialize DropboxSync if configured."""
         try:
+            from lib.dropbox_sync import create_dropbox_sync
             self.dropbox_sync = create_dropbox_sync(self.config)
             if self.dropbox_sync:
                 if self.dropbox_sync.is_configured:
@@ -193,6 +344,11 @@ class MemoryObserver:
 
     def on_file_change(self, file_path: Path, event_type: str) -> None:
         """Handle file change events from FileWatcher."""
+        if file_path.suffix.lower() not in self.HANDLED_SUFFIXES:
+            return
+
+        from lib.memory_writer import MemoryWriterError
+
         try:
             if not self._should_handle_event(file_path, event_type):
                 return
@@ -206,33 +362,35 @@ class MemoryObserver:
                 category=category
             )
 
-            metadata = {
-                "source": str(file_path),
-                "synced_at": datetime.now().isoformat(),
-                "category": category,
-                "event_type": event_type,
-                "oc_memory_version": __version__,
-            }
-            self.memory_writer.add_metadata(target_file, metadata)
+            metadata = self._metadata_template.copy()
+            metadata["source"] = str(file_path)
+            metadata["synced_at"] = datetime.now().isoformat(timespec='seconds')
+            metadata["category"] = category
+            metadata["event_type"] = event_type
+            if self.metadata_index:
+                self.memory_writer.record_metadata(target_file, metadata)
+            else:
+                self.memory_writer.add_metadata(target_file, metadata)
             self.files_processed += 1
 
             # 2. Extract observations via LLM (if available)
-            extracted = False
             if self.observer:
-                extracted = self._extract_observations_from_file(file_path)
-            elif not self.observer and self._fallback_logged.get(str(file_path.resolve())) is not None:
+                data = self._unseen_content(file_path)
+                if data is None:
+                    self.logger.info(
+                        f"Skipping extraction for {file_path.name}: same content extracted recently"
+                    )
+                elif self._loop is not None:
+                    # Runs concurrently with other files; falls back on its own
+                    self._submit_extraction(file_path, data)
+                elif not self._extract_observations_from_file(file_path, data):
+                    # Keep context continuity even when extraction fails or returns no structured facts
+                    self._record_fallback_observation(file_path)
+            elif self._fallback_logged.get(str(file_path.resolve())) is not None:
                 # Keep map fresh even when observer is disabled
                 self._fallback_logged.pop(str(file_path.resolve()), None)
 
-            if self.observer and not extracted:
-                # Keep context continuity even when extraction fails or returns no structured facts
-                self._record_fallback_observation(file_path)
-
-            self.logger.info(
-                f"Synced to memory: {target_file} "
-                f"(files: {self.files_processed}, "
-                f"observations: {self.observations_extracted})"
-            )
+            self.logger.info(f"Synced to memory: {target_file}")
 
         except MemoryWriterError as e:
             self.errors += 1
@@ -271,52 +429,227 @@ class MemoryObserver:
         self._last_event_ts[key] = now
         return True
 
-    def _extract_observations_from_file(self, file_path: Path) -> bool:
-        """Read a file and extract observations via LLM.
+    def _unseen_content(self, file_path: Path) -> Optional[bytes]:
+        """Read a changed file for extraction.
 
-        Supports markdown files and JSONL transcript files.
+        Returns None when identical content was already sent to the LLM
+        within CONTENT_HASH_TTL, and b"" when the file cannot be read.
         """
         try:
-            if file_path.suffix.lower() == '.jsonl':
-                messages = self._load_session_messages(file_path)
-                if not messages:
-                    return False
-            else:
-                content = file_path.read_text(encoding='utf-8')
-                if not content.strip():
-                    return False
-                messages = [{"role": "user", "content": content}]
+            data = file_path.read_bytes()
+        except OSError as e:
+            self.logger.warning(f"Observation extraction failed for {file_path}: {e}")
+            return b""
+        if not data.strip():
+            return data
+
+        digest = self._content_digest(data)
+        now = time.monotonic()
+        with self._content_hash_lock:
+            seen = self._content_hashes.get(digest)
+            if seen is not None and now - seen < self.CONTENT_HASH_TTL:
+                return None
+            self._content_hashes[digest] = now
+            self._content_hashes.move_to_end(digest)
+            while len(self._content_hashes) > self.CONTENT_HASH_MAX:
+                self._content_hashes.popitem(last=False)
+        return data
+
+    @staticmethod
+    def _content_digest(data: bytes) -> bytes:
+        """Key for recognising content already sent to the LLM"""
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def _forget_content(self, data: Optional[bytes]) -> None:
+        """Let the next event with this content be extracted again.
+
+        Called when extraction fails, so a retried save is not skipped as
+        a duplicate of content that never reached memory.
+        """
+        if not data:
+            return
+        with self._content_hash_lock:
+            self._content_hashes.pop(self._content_digest(data), None)
 
-            observations = self.retry_policy.call_with_retry(
-                self.observer.observe, messages
+    def _read_messages(self, file_path: Path, data: Optional[bytes] = None) -> list:
+        """Load the messages sent to the Observer for a changed file.
+
+        Supports markdown files and JSONL transcript files.
+        """
+        if file_path.suffix.lower() == '.jsonl':
+            return self._load_session_messages(file_path, data)
+        content = file_path.read_text(encoding='utf-8') if data is None else data.decode('utf-8')
+        if not content.strip():
+            return []
+        return [{"role": "user", "content": content}]
+
+    def _message_chunks(self, messages: list) -> List[list]:
+        """Split an oversized markdown note into one request per window.
+
+        JSONL transcripts are already capped by message count and are sent
+        whole.
+        """
+        if len(messages) != 1 or len(messages[0]['content']) <= self.EXTRACT_CHUNK_CHARS:
+            return [messages]
+        role = messages[0]['role']
+        return [
+            [{"role": role, "content": chunk}]
+            for chunk in _overlapping_chunks(
+                messages[0]['content'], self.EXTRACT_CHUNK_CHARS, self.EXTRACT_CHUNK_OVERLAP
             )
+        ]
 
-            if not observations:
+    def _extract_observations_from_file(self, file_path: Path, data: Optional[bytes] = None) -> bool:
+        """Read a file and extract observations via LLM."""
+        try:
+            messages = self._read_messages(file_path, data)
+            if not messages:
                 return False
 
-            # Add to MemoryMerger (active_memory.md)
-            added = self.merger.add_observations(observations)
-
-            # Add to ChromaDB (if available)
-            if self.memory_store:
-                try:
-                    self.memory_store.add_observations(observations)
-                except Exception as e:
-                    self.logger.warning(f"Failed to add to MemoryStore: {e}")
-
-            self.observations_extracted += added
-            self.logger.info(
-                f"Extracted {added} observations from {file_path.name}"
+            observations = _dedupe_observations(
+                self.retry_policy.call_with_retry(
+                    self.observer.observe, chunk, raise_errors=True
+                )
+                for chunk in self._message_chunks(messages)
             )
+            return self._apply_observations(file_path, observations)
 
-            # Reverse lookup: recover Cold memories for unknown topics
-            self._try_reverse_lookup(observations)
-            return bool(added)
+        except Exception as e:
+            self.logger.warning(f"Observation extraction failed for {file_path}: {e}")
+            self._forget_content(data)
+            return False
 
+    def _submit_extraction(self, file_path: Path, data: Optional[bytes] = None) -> None:
+        """Hand a file to the extraction loop without waiting for the LLM."""
+        try:
+            messages = self._read_messages(file_path, data)
         except Exception as e:
             self.logger.warning(f"Observation extraction failed for {file_path}: {e}")
+            self._forget_content(data)
+            messages = []
+
+        future = asyncio.run_coroutine_threadsafe(
+            self._aextract_observations(file_path, messages, data), self._loop
+        )
+        self._pending_extractions.add(future)
+        future.add_done_callback(self._pending_extractions.discard)
+
+    async def _aextract_observations(
+        self, file_path: Path, messages: list, data: Optional[bytes] = None
+    ) -> bool:
+        """Extract observations on the event loop, then merge them in order.
+
+        LLM calls for different files overlap up to llm.max_concurrency;
+        active_memory.md is rewritten on every merge, so merges (and
+        fallback entries) run one at a time on the merge thread.
+        """
+        loop = asyncio.get_running_loop()
+        extracted = False
+        if messages:
+            if self._llm_semaphore is None:
+                self._llm_semaphore = asyncio.Semaphore(max(1, self.llm_max_concurrency))
+
+            async def observe(chunk: list) -> list:
+                async with self._llm_semaphore:
+                    return await self.retry_policy.acall_with_retry(
+                        self.observer.aobserve, chunk, raise_errors=True
+                    )
+
+            try:
+                observations = _dedupe_observations(await asyncio.gather(
+                    *(observe(chunk) for chunk in self._message_chunks(messages))
+                ))
+                extracted = await loop.run_in_executor(
+                    self._merge_executor, self._apply_observations, file_path, observations
+                )
+            except Exception as e:
+                self.logger.warning(f"Observation extraction failed for {file_path}: {e}")
+                self._forget_content(data)
+
+        if not extracted:
+            await loop.run_in_executor(
+                self._merge_executor, self._record_fallback_observation, file_path
+            )
+        return extracted
+
+    def _apply_observations(self, file_path: Path, observations: list) -> bool:
+        """Merge extracted observations into memory; True if any were added."""
+        if not observations:
             return False
 
+        # Add to MemoryMerger (active_memory.md)
+        added = self.merger.add_observations(observations)
+
+        # Add to ChromaDB (if available), batched across files
+        if self.memory_store:
+            self._buffer_for_store(observations)
+
+        self.observations_extracted += added
+        self.logger.info(
+            f"Extracted {added} observations from {file_path.name}"
+        )
+
+        # Reverse lookup: recover Cold memories for unknown topics
+        self._try_reverse_lookup(observations)
+        return bool(added)
+
+    def _start_extraction_loop(self) -> None:
+        """Start the event loop thread used for concurrent extraction."""
+        try:
+            import uvloop  # optional; faster loop and socket handling
+            self._loop = uvloop.new_event_loop()
+        except ImportError:
+            self._loop = asyncio.new_event_loop()
+        self._llm_semaphore = None  # bound to the new loop on first use
+        self._merge_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='oc-merge')
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name='oc-llm-loop', daemon=True
+        )
+        self._loop_thread.start()
+
+    def _stop_extraction_loop(self, timeout: float = 60.0) -> None:
+        """Let in-flight extractions finish, then stop the event loop thread."""
+        if self._loop is None:
+            return
+
+        pending = list(self._pending_extractions)
+        if pending:
+            self.logger.info(f"Waiting for {len(pending)} pending extractions...")
+            _, not_done = wait_futures(pending, timeout=timeout)
+            for future in not_done:
+                future.cancel()
+
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join()
+        self._loop.close()
+        self._merge_executor.shutdown(wait=True)
+        self._loop = None
+        self._loop_thread = None
+
+    def _buffer_for_store(self, observations: list) -> None:
+        """Queue observations for the vector store, writing once the batch is full."""
+        with self._obs_buffer_lock:
+            self._obs_buffer.extend(observations)
+            if len(self._obs_buffer) < self.OBS_BUFFER_SIZE:
+                return
+            batch, self._obs_buffer = self._obs_buffer, []
+        self._write_to_store(batch)
+
+    def _flush_observation_buffer(self) -> None:
+        """Write any buffered observations to the vector store."""
+        with self._obs_buffer_lock:
+            batch, self._obs_buffer = self._obs_buffer, []
+        if batch:
+            self._write_to_store(batch)
+
+    def _write_to_store(self, batch: list) -> None:
+        """Upsert one batch of observations into the vector store."""
+        with self._store_write_lock:
+            try:
+                self.memory_store.add_observations(batch)
+            except Exception as e:
+                self.logger.warning(f"Failed to add {len(batch)} observations to MemoryStore: {e}")
+
     def _record_fallback_observation(self, file_path: Path) -> None:
         """Write a lightweight fallback entry when structured extraction yields no result."""
         signature_key = str(file_path.resolve())
@@ -343,33 +676,34 @@ class MemoryObserver:
         except Exception as e:
             self.logger.warning(f"Failed to write fallback entry for {file_path}: {e}")
 
-    def _load_session_messages(self, file_path: Path):
+    def _load_session_messages(self, file_path: Path, data: Optional[bytes] = None):
         """Load role/content messages from a JSONL session log file."""
+        if data is None:
+            data = file_path.read_bytes()
         messages = []
-        with file_path.open('r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    obj = json.loads(line)
-                except Exception:
-                    continue
+        for line in data.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = _json_loads(line)
+            except Exception:
+                continue
 
-                role = str(obj.get('role') or obj.get('type') or 'user').lower()
-                content = obj.get('content')
-                if isinstance(content, dict):
-                    content = content.get('text') or content.get('content') or ''
-                if not isinstance(content, str):
-                    continue
-                content = content.strip()
-                if not content:
-                    continue
+            role = str(obj.get('role') or obj.get('type') or 'user').lower()
+            content = obj.get('content')
+            if isinstance(content, dict):
+                content = content.get('text') or content.get('content') or ''
+            if not isinstance(content, str):
+                continue
+            content = content.strip()
+            if not content:
+                continue
 
-                if role not in {'user', 'assistant', 'system'}:
-                    role = 'user'
+            if role not in {'user', 'assistant', 'system'}:
+                role = 'user'
 
-                messages.append({"role": role, "content": content})
+            messages.append({"role": role, "content": content})
 
         if len(messages) > 400:
             messages = messages[-400:]
@@ -384,24 +718,34 @@ class MemoryObserver:
         if not has_obsidian and not has_dropbox:
             return
 
-        memory_dir = Path(self.config['memory']['dir']).expanduser().resolve()
-
-        for obs in observations:
-            query = obs.content[:200]
-
-            # Check if topic already exists in Hot memory
-            if self.memory_store:
-                try:
-                    results = self.memory_store.search(query, n_results=1)
-                    if results and results[0].get('distance', 2.0) < 1.5:
-                        continue  # Known topic, skip
-                except Exception as e:
-                    self.logger.debug(f"MemoryStore search failed, falling back to text: {e}")
-                    if self._topic_exists_in_active_memory(query):
-                        continue
-            else:
-                if self._topic_exists_in_active_memory(query):
-                    continue
+        memory_dir = self._memory_dir
+
+        # Observations sharing a topic prefix only need one lookup
+        queries = list(dict.fromkeys(obs.content[:200] for obs in observations))
+
+        # Observations waiting for the batched store upsert (these included)
+        # count as known, just as they would match themselves once written
+        with self._obs_buffer_lock:
+            buffered = {obs.content[:200] for obs in self._obs_buffer}
+        queries = [query for query in queries if query not in buffered]
+        if not queries:
+            return
+
+        # Check all topics against Hot memory with a single vector query
+        nearest = None
+        if self.memory_store:
+            try:
+                nearest = self.memory_store.search_batch(queries, n_results=1)
+            except Exception as e:
+                self.logger.debug(f"MemoryStore search failed, falling back to text: {e}")
+
+        for i, query in enumerate(queries):
+            if nearest is not None:
+                results = nearest[i]
+                if results and results[0].get('distance', 2.0) < 1.5:
+                    continue  # Known topic, skip
+            elif self._topic_exists_in_active_memory(query):
+                continue
 
             # Unknown topic — try Obsidian first (local, fast), then Dropbox (remote, slow)
             recovered = self._recover_from_obsidian(query, memory_dir)
@@ -429,7 +773,7 @@ class MemoryObserver:
                     continue  # Already in Hot memory
                 if not src.exists():
                     continue
-                dest.write_text(src.read_text(encoding='utf-8'), encoding='utf-8')
+                shutil.copyfile(src, dest)
                 copied += 1
 
             if copied > 0:
@@ -460,56 +804,101 @@ class MemoryObserver:
             return False
 
     def _topic_exists_in_active_memory(self, query: str) -> bool:
-        """Fallback check: search active_memory.md text for topic keywords."""
+        """Fallback check: look up topic keywords among active_memory.md's words."""
         try:
-            active_memory = Path(self.config['memory']['dir']).expanduser().resolve() / "active_memory.md"
+            active_memory = self._active_memory_path
             if not active_memory.exists():
                 return False
-            content = active_memory.read_text(encoding='utf-8').lower()
+            st = active_memory.stat()
+            signature = (st.st_mtime_ns, st.st_size)
+            cache = self._active_memory_cache
+            if cache is None or cache[0] != signature:
+                # Rebuilt only when the file changed, not once per observation
+                text = active_memory.read_text(encoding='utf-8').lower()
+                cache = (signature, frozenset(_WORD_RE.findall(text)))
+                self._active_memory_cache = cache
+            known_words = cache[1]
             # Check if significant words from query appear in active memory
-            words = [w for w in query.lower().split() if len(w) > 3]
+            words = [w for w in _WORD_RE.findall(query.lower()) if len(w) > 3]
             if not words:
                 return False
-            matches = sum(1 for w in words if w in content)
+            matches = sum(1 for w in words if w in known_words)
             return matches / len(words) > 0.5
         except Exception:
             return False
 
-    def _run_periodic_tasks(self):
-        """Run periodic maintenance tasks (compression, TTL, Cold archive, Dropbox sync)."""
-        now = time.time()
+    def _schedule_periodic_tasks(self):
+        """Queue each maintenance task to first run one interval from now."""
+        for task, interval in (
+            (self._check_ttl, self.TTL_CHECK_INTERVAL),
+            (self._check_compression, self.COMPRESSION_CHECK_INTERVAL),
+            (self._queue_obsidian_sync, self.OBSIDIAN_SYNC_INTERVAL),
+            (self._queue_dropbox_sync, self.DROPBOX_SYNC_INTERVAL),
+            (self._archive_warm_to_cold, self.COLD_ARCHIVE_CHECK_INTERVAL),
+            (self._log_stats, self.STATS_LOG_INTERVAL),
+            (self._flush_observation_buffer, self.OBS_FLUSH_INTERVAL),
+            (self.memory_writer.flush_index, self.INDEX_FLUSH_INTERVAL),
+        ):
+            self._scheduler.enter(interval, 0, self._run_and_reschedule, (task, interval))
+
+    def _run_and_reschedule(self, task, interval: float):
+        """Run one periodic task, then queue its next run."""
+        try:
+            task()
+        except Exception as e:
+            self.logger.error(f"Periodic task {task.__name__} failed: {e}")
+        self._scheduler.enter(interval, 0, self._run_and_reschedule, (task, interval))
+
+    def _queue_obsidian_sync(self):
+        self._submit_sync('obsidian', self._sync_to_obsidian)
+
+    def _queue_dropbox_sync(self):
+        self._submit_sync('dropbox', self._sync_dropbox)
 
-        # TTL check (Hot -> Warm)
-        if now - self._last_ttl_check >= self.TTL_CHECK_INTERVAL:
-            self._last_ttl_check = now
+    def _submit_sync(self, sink: str, task) -> None:
+        """Run a sync task on the sync pool unless its previous run is still going."""
+        lock = self._sync_locks[sink]
+        if not lock.acquire(blocking=False):
+            self.logger.info(f"{sink.capitalize()} sync still running, skipping this run")
+            return
+
+        def run():
             try:
-                result = self.ttl_manager.check_and_archive()
-                if result.hot_to_warm > 0:
-                    self.logger.info(
-                        f"TTL archive: {result.hot_to_warm} files moved Hot->Warm"
-                    )
+                task()
             except Exception as e:
-                self.logger.error(f"TTL check failed: {e}")
+                self.logger.error(f"Periodic task {task.__name__} failed: {e}")
+            finally:
+                lock.release()
 
-        # Compression check
-        if now - self._last_compression_check >= self.COMPRESSION_CHECK_INTERVAL:
-            self._last_compression_check = now
-            self._check_compression()
-
-        # Obsidian sync (every 1 hour)
-        if now - self._last_obsidian_sync >= self.OBSIDIAN_SYNC_INTERVAL:
-            self._last_obsidian_sync = now
-            self._sync_to_obsidian()
+        if self._sync_pool is None:
+            self._sync_pool = ThreadPoolExecutor(
+                max_workers=len(self._sync_locks), thread_name_prefix='oc-sync'
+            )
+        self._sync_pool.submit(run)
 
-        # Dropbox sync (every 6 hours)
-        if now - self._last_dropbox_sync >= self.DROPBOX_SYNC_INTERVAL:
-            self._last_dropbox_sync = now
-            self._sync_dropbox()
+    def _check_ttl(self):
+        """Move expired Hot files to Warm storage."""
+        try:
+            result = self.ttl_manager.check_and_archive()
+            if result.hot_to_warm > 0:
+                self.logger.info(
+                    f"TTL archive: {result.hot_to_warm} files moved Hot->Warm"
+                )
+        except Exception as e:
+            self.logger.error(f"TTL check failed: {e}")
 
-        # Cold archive check (Warm -> Cold)
-        if now - self._last_cold_archive_check >= self.COLD_ARCHIVE_CHECK_INTERVAL:
-            self._last_cold_archive_check = now
-            self._archive_warm_to_cold()
+    def _log_stats(self):
+        """Log running totals when they changed since the last report."""
+        stats = (
+            self.files_processed, self.observations_extracted,
+            self.compressions_run, self.errors,
+        )
+        if stats == self._last_stats:
+            return
+        self._last_stats = stats
+        self.logger.info(
+            "Stats: files=%d observations=%d compressions=%d errors=%d", *stats
+        )
 
     def _archive_warm_to_cold(self):
         """Automatically move old Warm files into Cold storage when enabled."""
@@ -533,7 +922,7 @@ class MemoryObserver:
             self.logger.debug("Cold archive check: no eligible Warm files")
             return
 
-        cold_dir = self.obsidian_client.vault_path / self.obsidian_client.default_folder / self.cold_folder
+        cold_dir = self._obsidian_base / self.cold_folder
         cold_dir.mkdir(parents=True, exist_ok=True)
 
         moved = 0
@@ -601,65 +990,151 @@ class MemoryObserver:
             self.logger.error(f"Compression failed: {e}")
 
     def _sync_to_obsidian(self):
-        """Sync Hot memory files to Obsidian vault (every 1 hour)."""
+        """Sync Hot memory files to Obsidian vault (every 1 hour).
+
+        Files whose stat signature or content hash match the last sync are
+        left alone, so a steady-state pass only stats the tree.
+        """
         if not self.obsidian_client:
             return
 
-        memory_dir = Path(self.config['memory']['dir']).expanduser().resolve()
+        memory_dir = self._memory_dir
         if not memory_dir.exists():
             return
 
         synced = 0
+        unchanged = 0
         skipped = 0
         errors = 0
+        previous = self._obsidian_sync_state
+        state: Dict[str, list] = {}
+        base = self._obsidian_base
 
-        def _write(file_obj: Path, target_file: Path) -> bool:
-            content = file_obj.read_text(encoding='utf-8')
-            if not content.strip():
-                return None
-            target_file.write_text(content, encoding='utf-8')
-            return True
+        # Hot files, then Warm archive files (keeping their subfolders)
+        archive_dir = self.ttl_manager.archive_dir
+        sources = [(memory_dir, False, base / "hot")]
+        if archive_dir.exists():
+            sources.append((archive_dir, True, base / "archive"))
 
-        for md_file in memory_dir.glob("*.md"):
+        # The scan feeds a thread pool so reads and writes overlap
+        if self._obsidian_sync_executor is None:
+            self._obsidian_sync_executor = ThreadPoolExecutor(
+                max_workers=self.OBSIDIAN_SYNC_WORKERS, thread_name_prefix='oc-obsidian'
+            )
+        futures = {}
+        for root, recursive, target_root in sources:
+            for entry in self._iter_markdown_entries(root, recursive):
+                target_file = target_root / os.path.relpath(entry.path, root)
+                future = self._obsidian_sync_executor.submit(
+                    self._sync_file_to_obsidian, entry, target_file, previous, state
+                )
+                futures[future] = entry.name
+
+        for future in as_completed(futures):
             try:
-                target_file = (self.obsidian_client.vault_path / f"{self.obsidian_client.default_folder}/hot/{md_file.name}")
-                target_file.parent.mkdir(parents=True, exist_ok=True)
-                copied = _write(md_file, target_file)
-                if copied:
+                result = future.result()
+                if result == 'synced':
                     synced += 1
-                elif copied is None:
+                elif result == 'unchanged':
+                    unchanged += 1
+                else:
                     skipped += 1
             except Exception as e:
                 errors += 1
-                self.logger.error(f"Obsidian sync failed for {md_file.name}: {e}")
+                self.logger.error(f"Obsidian sync failed for {futures[future]}: {e}")
 
-        # Also sync Warm archive files
-        archive_dir = self.ttl_manager.archive_dir
-        if archive_dir.exists():
-            for md_file in archive_dir.rglob("*.md"):
-                try:
-                    rel_path = md_file.relative_to(archive_dir)
-                    target_dir = self.obsidian_client.vault_path / f"{self.obsidian_client.default_folder}/archive/{rel_path.parent}"
-                    target_dir.mkdir(parents=True, exist_ok=True)
-                    target_file = target_dir / md_file.name
-                    copied = _write(md_file, target_file)
-                    if copied:
-                        synced += 1
-                    elif copied is None:
-                        skipped += 1
-                except Exception as e:
-                    errors += 1
-                    self.logger.error(f"Obsidian sync failed for {md_file.name}: {e}")
+        # Files that disappeared since the last pass drop out of the state
+        self._obsidian_sync_state = state
 
         if errors > 0:
-            self.logger.warning(f"Obsidian sync: {synced} synced, {skipped} skipped, {errors} errors")
+            self.logger.warning(
+                f"Obsidian sync: {synced} synced, {unchanged} unchanged, "
+                f"{skipped} skipped, {errors} errors"
+            )
         elif synced > 0:
-            self.logger.info(f"Obsidian sync: {synced} files synced")
+            self.logger.info(f"Obsidian sync: {synced} files synced, {unchanged} unchanged")
+        elif unchanged > 0:
+            self.logger.info(f"Obsidian sync: {unchanged} files unchanged")
         elif skipped > 0:
             self.logger.info(f"Obsidian sync: {skipped} files skipped (empty content)")
         else:
             self.logger.warning("Obsidian sync: no files available")
 
+    def _iter_markdown_entries(self, root: Path, recursive: bool):
+        """Yield os.DirEntry objects for *.md files under root."""
+        stack = [str(root)]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            if recursive:
+                                stack.append(entry.path)
+                        elif entry.name.endswith('.md') and entry.is_file():
+                            yield entry
+            except OSError as e:
+                self.logger.warning(f"Cannot scan {root} for Obsidian sync: {e}")
+
+    @staticmethod
+    def _sync_file_to_obsidian(
+        entry: os.DirEntry, target_file: Path, previous: Dict[str, list], state: Dict[str, list]
+    ) -> str:
+        """Copy one file into the vault unless it is unchanged since the last sync.
+
+        Returns:
+            'synced', 'unchanged', or 'empty'
+        """
+        st = entry.stat()
+        cached = previous.get(entry.path)
+        if (
+            cached
+            and cached[0] == st.st_mtime_ns
+            and cached[1] == st.st_size
+            and target_file.exists()
+        ):
+            state[entry.path] = cached
+            return 'unchanged'
+        if st.st_size == 0:
+            return 'empty'
+
+        # Raw bytes are hashed and written as-is; nothing is decoded
+        data = Path(entry.path).read_bytes()
+        if not data.strip():
+            return 'empty'
+
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        state[entry.path] = [st.st_mtime_ns, st.st_size, digest]
+        if cached and cached[2] == digest and target_file.exists():
+            return 'unchanged'
+
+        target_file.parent.mkdir(parents=True, exist_ok=True)
+        target_file.write_bytes(data)
+        return 'synced'
+
+    def _obsidian_sync_state_path(self) -> Path:
+        return self._memory_dir / self.OBSIDIAN_SYNC_STATE_FILE
+
+    def _load_obsidian_sync_state(self) -> None:
+        """Restore sync signatures saved by a previous run."""
+        try:
+            data = json.loads(self._obsidian_sync_state_path().read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable Obsidian sync state: {e}")
+            return
+        if isinstance(data, dict):
+            self._obsidian_sync_state = data
+
+    def _save_obsidian_sync_state(self) -> None:
+        """Persist sync signatures so a restart does not recopy the vault."""
+        try:
+            self._obsidian_sync_state_path().write_text(
+                json.dumps(self._obsidian_sync_state), encoding='utf-8'
+            )
+        except Exception as e:
+            self.logger.warning(f"Failed to save Obsidian sync state: {e}")
+
     def _sync_dropbox(self):
         """Sync Obsidian OC-Memory folder to Dropbox."""
         if not self.dropbox_sync:
@@ -672,9 +1147,7 @@ class MemoryObserver:
             return
 
         try:
-            local_dir = None
-            if self.obsidian_client:
-                local_dir = self.obsidian_client.vault_path / self.obsidian_client.default_folder
+            local_dir = self._obsidian_base
 
             result = self.dropbox_sync.sync_folder(
                 local_dir=local_dir,
@@ -692,15 +1165,15 @@ class MemoryObserver:
             self.logger.error(f"Dropbox sync failed: {e}")
 
     def _detect_category(self, file_path: Path) -> str:
-        if not self.config['memory'].get('auto_categorize', True):
+        if not self.auto_categorize:
             return 'general'
         return self.memory_writer.get_category_from_path(file_path)
 
     def start(self) -> None:
         """Start the observer daemon."""
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         self.logger.info(f"Starting OC-Memory Observer v{__version__}")
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         self.logger.info(f"Watch directories: {self.config['watch']['dirs']}")
         self.logger.info(f"Memory directory: {self.config['memory']['dir']}")
         self.logger.info(f"Observer: {'enabled' if self.observer else 'disabled'}")
@@ -708,11 +1181,16 @@ class MemoryObserver:
         self.logger.info(f"MemoryStore: {'enabled' if self.memory_store else 'disabled'}")
         self.logger.info(f"Obsidian: {'enabled' if self.obsidian_client else 'disabled'}")
         self.logger.info(f"Dropbox: {'enabled' if self.dropbox_sync and self.dropbox_sync.is_configured else 'disabled'}")
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
 
+        # Reset before the handlers go in, so a signal during startup sticks
+        self._stop_event.clear()
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
+        if self.observer:
+            self._start_extraction_loop()
+
         try:
             self.file_watcher.start()
         except Exception as e:
@@ -720,35 +1198,52 @@ class MemoryObserver:
             raise
 
         self.running = True
-        self._last_ttl_check = time.time()
-        self._last_compression_check = time.time()
-        self._last_obsidian_sync = time.time()
-        self._last_dropbox_sync = time.time()
-        self._last_cold_archive_check = time.time()
+        self._schedule_periodic_tasks()
         self.logger.info("OC-Memory Observer started successfully")
         self.logger.info("Monitoring for file changes... (Press Ctrl+C to stop)")
 
-        # Main loop with periodic tasks
-        try:
-            while self.running:
-                self._run_periodic_tasks()
-                time.sleep(1)
-        except KeyboardInterrupt:
-            self.logger.info("Received keyboard interrupt")
+        # Main loop: run due tasks, then sleep until the next one is due or a
+        # stop is requested
+        while not self._stop_event.is_set():
+            delay = self._scheduler.run(blocking=False)
+            if delay is None:
+                break
+            self._stop_event.wait(delay)
 
-        self.stop()
+        if self.running:
+            self.stop()
 
     def stop(self) -> None:
         """Stop the observer daemon."""
         self.logger.info("Stopping OC-Memory Observer...")
         self.running = False
+        self._stop_event.set()
+        for event in self._scheduler.queue:
+            try:
+                self._scheduler.cancel(event)
+            except ValueError:
+                pass  # already ran
 
         if self.file_watcher.is_alive():
             self.file_watcher.stop()
-
-        self.logger.info("=" * 60)
+        self._stop_extraction_loop()
+        self.memory_writer.close_index()
+        if self.memory_store:
+            self._flush_observation_buffer()
+        if self._sync_pool is not None:
+            self._sync_pool.shutdown(wait=True)
+            self._sync_pool = None
+        if self.dropbox_sync:
+            self.dropbox_sync.close()
+        if self.obsidian_client:
+            self._save_obsidian_sync_state()
+        if self._obsidian_sync_executor is not None:
+            self._obsidian_sync_executor.shutdown(wait=True)
+            self._obsidian_sync_executor = None
+
+        self.logger.info(_BANNER)
         self.logger.info("OC-Memory Observer Statistics")
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         self.logger.info(f"Files processed: {self.files_processed}")
         self.logger.info(f"Observations extracted: {self.observations_extracted}")
         self.logger.info(f"Compressions run: {self.compressions_run}")
@@ -758,17 +1253,22 @@ class MemoryObserver:
         if self.reflector:
             stats = self.reflector.get_stats()
             self.logger.info(f"Compression stats: {stats}")
-        self.logger.info("=" * 60)
+        self.logger.info(_BANNER)
         self.logger.info("OC-Memory Observer stopped")
 
     def _signal_handler(self, signum: int, frame) -> None:
         self.logger.info(f"Received signal {signum}")
-        self.stop()
-        sys.exit(0)
+        # start() wakes up, leaves its loop, and runs stop()
+        self._stop_event.set()
+
 
+def setup_logging(config: dict) -> logging.handlers.QueueListener:
+    """Setup logging configuration.
 
-def setup_logging(config: dict) -> None:
-    """Setup logging configuration."""
+    Loggers only enqueue records; a QueueListener thread does the file and
+    console writes. The returned listener is already running and is
+    stopped at exit, before logging flushes and closes its handlers.
+    """
     log_config = config.get('logging', {})
     level = getattr(logging, log_config.get('level', 'INFO'))
     log_file = log_config.get('file', 'oc-memory.log')
@@ -776,11 +1276,27 @@ def setup_logging(config: dict) -> None:
 
     handlers = []
 
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file,
+        maxBytes=int(log_config.get('max_bytes', 10 * 1024 * 1024)),
+        backupCount=int(log_config.get('backup_count', 5)),
+        encoding='utf-8'
+    )
     file_handler.setFormatter(
         logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
     )
-    handlers.append(file_handler)
+
+    # Batch file writes; errors flush immediately, and logging.shutdown()
+    # flushes whatever is left at exit
+    buffer_records = int(log_config.get('buffer_records', 256))
+    if buffer_records > 0:
+        handlers.append(logging.handlers.MemoryHandler(
+            capacity=buffer_records,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        ))
+    else:
+        handlers.append(file_handler)
 
     if console:
         console_handler = logging.StreamHandler()
@@ -789,7 +1305,20 @@ def setup_logging(config: dict) -> None:
         )
         handlers.append(console_handler)
 
-    logging.basicConfig(level=level, handlers=handlers)
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    # atexit runs newest first, so this drains the queue ahead of
+    # logging.shutdown(); it also keeps the handlers referenced until then
+    atexit.register(listener.stop)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Records are formatted by the listener's handlers; keep basicConfig
+    # from giving the queue handler a formatter of its own
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    return listener
 
 
 def main() -> None:
@@ -8,6 +8,7 @@ Usage:
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 from typing import Dict, Any, List
@@ -28,6 +29,9 @@ except ImportError:
     from questionary import Style
     import yaml
 
+# Prefer the libyaml-backed dumper when PyYAML was built with it
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 
 # ============================================================================
 # Custom Style
@@ -47,6 +51,53 @@ custom_style = Style([
 ])
 
 
+# ============================================================================
+# Banners
+# ============================================================================
+
+_SEP = "=" * 70
+
+_WELCOME_BANNER = """
+╔════════════════════════════════════════════════════════════════╗
+║                                                                ║
+║   🧠 OC-Memory Setup Wizard                                   ║
+║                                                                ║
+║   External Observational Memory for OpenClaw                  ║
+║   Version 0.1.0 (MVP)                                         ║
+║                                                                ║
+╚════════════════════════════════════════════════════════════════╝
+
+This wizard will help you configure OC-Memory in 5 simple steps.
+Setup typically takes less than 3 minutes.
+"""
+
+_STEP1_HEADER = f"\n{_SEP}\n📂 STEP 1: Watch Directories\n{_SEP}"
+_STEP2_HEADER = f"\n{_SEP}\n💾 STEP 2: OpenClaw Memory Directory\n{_SEP}"
+_STEP3_HEADER = f"\n{_SEP}\n📝 STEP 3: Logging Configuration\n{_SEP}"
+_STEP4_HEADER = f"\n{_SEP}\n✨ STEP 4: Optional Features (Phase 2+)\n{_SEP}"
+_STEP5_HEADER = f"\n{_SEP}\n📋 STEP 5: Review Configuration\n{_SEP}\n"
+_STEP6_HEADER = f"\n{_SEP}\n🎉 STEP 6: Setup Complete!\n{_SEP}\n"
+
+
+# Assignment line for one .env key, with optional "export" and spacing
+_ENV_ASSIGN_TEMPLATE = r'^([ \t]*(?:export[ \t]+)?){key}[ \t]*=.*$'
+
+
+# Provider choice value -> (default model, API key environment variable)
+_LLM_PROVIDERS = {
+    'openai': ('gpt-4o-mini', 'OPENAI_API_KEY'),
+    'google': ('gemini-2.0-flash', 'GOOGLE_API_KEY'),
+}
+
+# Whole positive integer in ASCII digits (str.isdigit() also accepts "²")
+_POSITIVE_INT_RE = re.compile(r'0*[1-9][0-9]*')
+
+
+def _is_positive_int(text: str) -> bool:
+    """Prompt validator for positive whole numbers"""
+    return _POSITIVE_INT_RE.fullmatch(text) is not None
+
+
 # ============================================================================
 # Setup Wizard
 # ============================================================================
@@ -59,6 +110,9 @@ class SetupWizard:
         self.project_root = Path(__file__).parent
         self.config_path = self.project_root / "config.yaml"
         self.env_path = self.project_root / ".env"
+        # Resolved once; every step builds its defaults from these
+        self.home_dir = Path.home()
+        self.documents_dir = self.home_dir / "Documents"
 
     def run(self):
         """Run the setup wizard"""
@@ -78,20 +132,7 @@ class SetupWizard:
 
     def print_banner(self):
         """Print welcome banner"""
-        banner = """
-╔════════════════════════════════════════════════════════════════╗
-║                                                                ║
-║   🧠 OC-Memory Setup Wizard                                   ║
-║                                                                ║
-║   External Observational Memory for OpenClaw                  ║
-║   Version 0.1.0 (MVP)                                         ║
-║                                                                ║
-╚════════════════════════════════════════════════════════════════╝
-
-This wizard will help you configure OC-Memory in 5 simple steps.
-Setup typically takes less than 3 minutes.
-        """
-        print(banner)
+        print(_WELCOME_BANNER)
 
     def confirm_start(self) -> bool:
         """Confirm to start setup"""
@@ -112,9 +153,7 @@ Setup typically takes less than 3 minutes.
 
     def step1_watch_directories(self):
         """Step 1: Configure watch directories"""
-        print("\n" + "="*70)
-        print("📂 STEP 1: Watch Directories")
-        print("="*70)
+        print(_STEP1_HEADER)
         print("\nOC-Memory monitors directories for markdown (.md) files.")
         print("When files are created/modified, they're synced to OpenClaw.\n")
 
@@ -122,9 +161,9 @@ Setup typically takes less than 3 minutes.
 
         # Common default directories
         default_dirs = [
-            Path.home() / "Documents" / "notes",
-            Path.home() / "Projects",
-            Path.home() / "Desktop"
+            self.documents_dir / "notes",
+            self.home_dir / "Projects",
+            self.home_dir / "Desktop"
         ]
 
         # Ask about each default
@@ -158,7 +197,7 @@ Setup typically takes less than 3 minutes.
 
         if not directories:
             print("⚠️  No directories selected. Adding default: ~/Documents/notes")
-            directories = [str(Path.home() / "Documents" / "notes")]
+            directories = [str(self.documents_dir / "notes")]
 
         # Recursive watching
         recursive = questionary.confirm(
@@ -177,14 +216,12 @@ Setup typically takes less than 3 minutes.
 
     def step2_memory_directory(self):
         """Step 2: Configure OpenClaw memory directory"""
-        print("\n" + "="*70)
-        print("💾 STEP 2: OpenClaw Memory Directory")
-        print("="*70)
+        print(_STEP2_HEADER)
         print("\nThis is where synced files will be stored.")
         print("OpenClaw automatically indexes files in this directory.\n")
 
         # Default path
-        default_memory_dir = Path.home() / ".openclaw" / "workspace" / "memory"
+        default_memory_dir = self.home_dir / ".openclaw" / "workspace" / "memory"
 
         use_default = questionary.confirm(
             f"Use default OpenClaw memory directory?\n  {default_memory_dir}",
@@ -202,24 +239,26 @@ Setup typically takes less than 3 minutes.
                 style=custom_style
             ).ask()
 
-        # Auto-categorization
-        auto_categorize = questionary.confirm(
-            "Auto-categorize files by path? (e.g., notes/, projects/)",
-            default=True,
-            style=custom_style
-        ).ask()
-
-        # Max file size
-        max_size_mb = questionary.select(
-            "Maximum file size to process:",
-            choices=[
-                "5 MB",
-                "10 MB (Recommended)",
-                "20 MB",
-                "50 MB"
-            ],
-            style=custom_style
-        ).ask()
+        # Independent follow-ups, asked as one form
+        answers = questionary.form(
+            auto_categorize=questionary.confirm(
+                "Auto-categorize files by path? (e.g., notes/, projects/)",
+                default=True,
+                style=custom_style
+            ),
+            max_size_mb=questionary.select(
+                "Maximum file size to process:",
+                choices=[
+                    "5 MB",
+                    "10 MB (Recommended)",
+                    "20 MB",
+                    "50 MB"
+                ],
+                style=custom_style
+            ),
+        ).unsafe_ask()  # Ctrl+C propagates to main()
+        auto_categorize = answers['auto_categorize']
+        max_size_mb = answers['max_size_mb']
 
         max_size_bytes = int(max_size_mb.split()[0]) * 1024 * 1024
 
@@ -233,43 +272,33 @@ Setup typically takes less than 3 minutes.
 
     def step3_logging(self):
         """Step 3: Configure logging"""
-        print("\n" + "="*70)
-        print("📝 STEP 3: Logging Configuration")
-        print("="*70)
+        print(_STEP3_HEADER)
         print("\nConfigure how OC-Memory logs its activity.\n")
 
-        # Log level
-        log_level = questionary.select(
-            "Select log level:",
-            choices=[
-                "INFO (Recommended - Normal operation)",
-                "DEBUG (Verbose - For troubleshooting)",
-                "WARNING (Quiet - Errors only)"
-            ],
-            style=custom_style
-        ).ask()
-
-        level_map = {
-            "INFO": "INFO",
-            "DEBUG": "DEBUG",
-            "WARNING": "WARNING"
-        }
-        level = [v for k, v in level_map.items() if k in log_level][0]
-
-        # Log file
-        default_log_file = "oc-memory.log"
-        log_file = questionary.text(
-            "Log file name:",
-            default=default_log_file,
-            style=custom_style
-        ).ask()
-
-        # Console output
-        console = questionary.confirm(
-            "Also print logs to console?",
-            default=True,
-            style=custom_style
-        ).ask()
+        answers = questionary.form(
+            level=questionary.select(
+                "Select log level:",
+                choices=[
+                    questionary.Choice("INFO (Recommended - Normal operation)", value="INFO"),
+                    questionary.Choice("DEBUG (Verbose - For troubleshooting)", value="DEBUG"),
+                    questionary.Choice("WARNING (Quiet - Errors only)", value="WARNING"),
+                ],
+                style=custom_style
+            ),
+            log_file=questionary.text(
+                "Log file name:",
+                default="oc-memory.log",
+                style=custom_style
+            ),
+            console=questionary.confirm(
+                "Also print logs to console?",
+                default=True,
+                style=custom_style
+            ),
+        ).unsafe_ask()  # Ctrl+C propagates to main()
+        level = answers['level']
+        log_file = answers['log_file']
+        console = answers['console']
 
         self.config['logging'] = {
             'level': level,
@@ -281,9 +310,7 @@ Setup typically takes less than 3 minutes.
 
     def step4_optional_features(self):
         """Step 4: Optional features (Phase 2+)"""
-        print("\n" + "="*70)
-        print("✨ STEP 4: Optional Features (Phase 2+)")
-        print("="*70)
+        print(_STEP4_HEADER)
         print("\nThese features are for advanced usage and will be implemented")
         print("in future phases. You can skip this for now.\n")
 
@@ -336,7 +363,7 @@ Setup typically takes less than 3 minutes.
         ttl_days = questionary.text(
             "Hot memory TTL (days):",
             default="90",
-            validate=lambda x: x.isdigit() and int(x) > 0,
+            validate=_is_positive_int,
             style=custom_style
         ).ask()
 
@@ -349,17 +376,17 @@ Setup typically takes less than 3 minutes.
         """Configure LLM settings"""
         print("\n🤖 LLM Configuration\n")
 
-        provider = questionary.select(
+        provider_name = questionary.select(
             "Select LLM provider:",
             choices=[
-                "OpenAI (gpt-4o-mini)",
-                "Google (gemini-2.0-flash)",
-                "Skip for now"
+                questionary.Choice("OpenAI (gpt-4o-mini)", value="openai"),
+                questionary.Choice("Google (gemini-2.0-flash)", value="google"),
+                questionary.Choice("Skip for now", value="skip"),
             ],
             style=custom_style
         ).ask()
 
-        if "Skip" in provider:
+        if provider_name == "skip":
             self.config['llm'] = {
                 'enabled': False,
                 'provider': 'openai',
@@ -369,14 +396,7 @@ Setup typically takes less than 3 minutes.
             return
 
         # Provider-specific settings
-        if "OpenAI" in provider:
-            model = "gpt-4o-mini"
-            api_key_env = "OPENAI_API_KEY"
-            provider_name = "openai"
-        else:  # Google
-            model = "gemini-2.0-flash"
-            api_key_env = "GOOGLE_API_KEY"
-            provider_name = "google"
+        model, api_key_env = _LLM_PROVIDERS[provider_name]
 
         # Check for API key
         has_key = questionary.confirm(
@@ -416,7 +436,7 @@ Setup typically takes less than 3 minutes.
         if enable_obsidian:
             vault_path = questionary.path(
                 "Obsidian vault path:",
-                default=str(Path.home() / "Documents" / "ObsidianVault"),
+                default=str(self.documents_dir / "ObsidianVault"),
                 style=custom_style
             ).ask()
 
@@ -446,9 +466,7 @@ Setup typically takes less than 3 minutes.
 
     def step5_review_and_save(self):
         """Step 5: Review and save configuration"""
-        print("\n" + "="*70)
-        print("📋 STEP 5: Review Configuration")
-        print("="*70 + "\n")
+        print(_STEP5_HEADER)
 
         # Print summary
         print("Configuration Summary:")
@@ -507,32 +525,39 @@ Setup typically takes less than 3 minutes.
 
     def _save_config(self):
         """Save configuration to YAML file"""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(self.config, f, default_flow_style=False, sort_keys=False)
+        # Render in memory and write once; config_path sits in the project
+        # root, which always exists, so no mkdir is needed
+        content = yaml.dump(
+            self.config, Dumper=_YAML_DUMPER,
+            default_flow_style=False, sort_keys=False,
+        )
+        self.config_path.write_text(content, encoding='utf-8')
 
         print(f"\n✅ Configuration saved to: {self.config_path}")
 
     def _save_to_env(self, key: str, value: str):
         """Save environment variable to .env file"""
-        # Read existing .env
-        existing = {}
+        line = f"{key}={value}"
         if self.env_path.exists():
-            with open(self.env_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    line = line.strip()
-                    if '=' in line and not line.startswith('#'):
-                        k, v = line.split('=', 1)
-                        existing[k] = v
-
-        # Add/update key
-        existing[key] = value
-
-        # Write .env
-        with open(self.env_path, 'w', encoding='utf-8') as f:
-            f.write("# OC-Memory Environment Variables\n")
-            f.write("# ⚠️  DO NOT COMMIT THIS FILE TO GIT\n\n")
-            for k, v in existing.items():
-                f.write(f"{k}={v}\n")
+            # Rewrite only the key's own line(s); everything else is kept
+            # verbatim, including comments and lines in other formats
+            content = self.env_path.read_text(encoding='utf-8')
+            pattern = re.compile(
+                _ENV_ASSIGN_TEMPLATE.format(key=re.escape(key)), re.MULTILINE
+            )
+            content, replaced = pattern.subn(lambda m: m.group(1) + line, content)
+            if not replaced:
+                if content and not content.endswith('\n'):
+                    content += '\n'
+                content += line + '\n'
+        else:
+            content = (
+                "# OC-Memory Environment Variables\n"
+                "# ⚠️  DO NOT COMMIT THIS FILE TO GIT\n\n"
+                f"{line}\n"
+            )
+
+        self.env_path.write_text(content, encoding='utf-8')
 
         # Set permissions (Unix only)
         if os.name != 'nt':
@@ -542,9 +567,7 @@ Setup typically takes less than 3 minutes.
 
     def step6_post_install(self):
         """Step 6: Post-installation instructions"""
-        print("\n" + "="*70)
-        print("🎉 STEP 6: Setup Complete!")
-        print("="*70 + "\n")
+        print(_STEP6_HEADER)
 
         print("✅ OC-Memory is now configured!\n")
 
@@ -567,7 +590,7 @@ Setup typically takes less than 3 minutes.
             print("\n5️⃣  (Optional) Run as a background service:")
             print("   # See QUICKSTART.md for systemd/LaunchAgent setup")
 
-        print("\n" + "="*70)
+        print("\n" + _SEP)
         print("\n📚 Documentation:")
         print(f"   • Quick Start: {self.project_root / 'QUICKSTART.md'}")
         print(f"   • Implementation: {self.project_root / 'IMPLEMENTATION_ROADMAP.md'}")
@@ -576,7 +599,7 @@ Setup typically takes less than 3 minutes.
         print("\n🐛 Issues or Questions?")
         print("   GitHub Issues: https://github.com/[username]/oc-memory/issues")
 
-        print("\n" + "="*70)
+        print("\n" + _SEP)
         print("\n💡 Tip: Run 'python memory_observer.py --help' for more options")
         print("\nThank you for using OC-Memory! 🧠\n")
 
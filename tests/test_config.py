@@ -4,7 +4,9 @@ import pytest
 import yaml
 from pathlib import Path
 
-from lib.config import load_config, validate_config, expand_paths, get_config, ConfigError
+from lib.config import (
+    load_config, validate_config, expand_paths, get_config, resolve_path, ConfigError,
+)
 
 
 class TestLoadConfig:
@@ -79,3 +81,43 @@ class TestGetConfig:
         assert 'memory' in config
         # Paths should be expanded
         assert '~' not in config['memory']['dir']
+
+    def test_get_config_returns_independent_copies(self, sample_config_file):
+        first = get_config(str(sample_config_file))
+        first['memory']['dir'] = '/mutated'
+        second = get_config(str(sample_config_file))
+        assert second['memory']['dir'] != '/mutated'
+
+    def test_get_config_reloads_after_file_change(self, sample_config_file, sample_config):
+        get_config(str(sample_config_file))
+        sample_config['memory']['auto_categorize'] = False
+        with open(sample_config_file, 'w') as f:
+            yaml.dump(sample_config, f)
+        config = get_config(str(sample_config_file))
+        assert config['memory']['auto_categorize'] is False
+
+    def test_get_config_missing_file(self):
+        with pytest.raises(ConfigError, match="not found"):
+            get_config("nonexistent.yaml")
+
+    @pytest.mark.parametrize("section,key,value,message", [
+        ('watch', 'dirs', "/single/path", "must be a list"),
+        ('watch', 'dirs', None, "Missing 'dirs'"),
+        ('memory', 'dir', None, "Missing 'dir'"),
+    ])
+    def test_get_config_validates(self, temp_dir, sample_config, section, key, value, message):
+        if value is None:
+            del sample_config[section][key]
+        else:
+            sample_config[section][key] = value
+        config_file = temp_dir / "invalid.yaml"
+        with open(config_file, 'w') as f:
+            yaml.dump(sample_config, f)
+        with pytest.raises(ConfigError, match=message):
+            get_config(str(config_file))
+
+
+class TestResolvePath:
+    @pytest.mark.parametrize("raw", ["~", "~/notes/../memory", "relative/dir", "/tmp/../tmp"])
+    def test_matches_pathlib(self, raw):
+        assert resolve_path(raw) == str(Path(raw).expanduser().resolve())
@@ -2,6 +2,7 @@
 
 import pytest
 from pathlib import Path
+from unittest.mock import MagicMock
 
 from lib.dropbox_sync import DropboxSync, SyncResult, create_dropbox_sync
 
@@ -46,6 +47,15 @@ class TestDropboxSync:
         with pytest.raises(RuntimeError, match="not configured"):
             client._ensure_client()
 
+    def test_close_releases_client(self):
+        client = DropboxSync(app_key="key", refresh_token="token")
+        session = MagicMock()
+        client._client = session
+        client.close()
+        session.close.assert_called_once()
+        assert client._client is None
+        client.close()  # no-op once closed
+
     def test_upload_missing_file(self, temp_dir):
         client = DropboxSync(app_key="key", refresh_token="token")
         # Mock client so _ensure_client doesn't fail with real Dropbox
@@ -1,5 +1,6 @@
 """Tests for lib/error_handler.py"""
 
+import asyncio
 import time
 import pytest
 
@@ -59,6 +60,39 @@ class TestLLMRetryPolicy:
         )
         assert policy._calculate_delay(3) == 15.0  # 10 * 4 = 40 > 15
 
+    def test_jitter_stays_within_bounds(self):
+        policy = LLMRetryPolicy(base_delay=1.0, max_delay=2.5, jitter=1.0)
+        delays = [policy._backoff_delay(1) for _ in range(50)]
+        assert all(1.0 <= d <= 2.0 for d in delays)
+        assert all(policy._backoff_delay(2) <= 2.5 for _ in range(50))
+        assert LLMRetryPolicy(base_delay=1.0)._backoff_delay(1) == 1.0
+
+    def test_async_backoff_does_not_block_loop(self):
+        attempts = [0]
+
+        async def flaky():
+            attempts[0] += 1
+            if attempts[0] < 2:
+                raise ConnectionError("Temporary failure")
+            return "ok"
+
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def run():
+            policy = LLMRetryPolicy(max_attempts=3, base_delay=0.05)
+            result, _ = await asyncio.gather(policy.acall_with_retry(flaky), ticker())
+            return result, policy
+
+        result, policy = asyncio.run(run())
+        assert result == "ok"
+        assert policy.total_retries == 1
+        assert len(ticks) == 3 and ticks[-1] - ticks[0] < 0.05
+
     def test_retryable_exceptions_filter(self):
         """Only retry specific exception types"""
         call_count = [0]
@@ -0,0 +1,280 @@
+"""Tests for lib/file_watcher.py"""
+
+import errno
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from watchdog.events import FileModifiedEvent, FileCreatedEvent
+
+from watchdog.observers.polling import PollingObserver
+
+from lib.file_watcher import (
+    FileWatcher, MarkdownFileHandler, _BatchDispatcher, _is_network_fs,
+)
+
+
+class TestMarkdownFileHandler:
+    def test_supported_extensions(self):
+        handler = MarkdownFileHandler()
+        assert handler._is_supported_file("/notes/a.md")
+        assert handler._is_supported_file("/notes/a.MARKDOWN")
+        assert handler._is_supported_file("/logs/session.jsonl")
+        assert not handler._is_supported_file("/notes/a.txt")
+
+    def test_patterns_narrow_supported_files(self):
+        handler = MarkdownFileHandler(patterns=["meeting-*.md", "*.jsonl"])
+        assert handler._is_supported_file("/notes/Meeting-2024.md")
+        assert handler._is_supported_file("/logs/session.jsonl")
+        assert not handler._is_supported_file("/notes/todo.md")
+        # Patterns never widen the supported extensions
+        assert not MarkdownFileHandler(patterns=["*"])._is_supported_file("/a.txt")
+
+    def test_unbatched_dispatch_is_immediate(self, temp_dir):
+        callback = MagicMock()
+        handler = MarkdownFileHandler(callback=callback)
+        handler.on_modified(FileModifiedEvent(str(temp_dir / "a.md")))
+        callback.assert_called_once_with(temp_dir / "a.md", event_type='modified')
+
+    def test_ignores_unsupported_files(self, temp_dir):
+        callback = MagicMock()
+        handler = MarkdownFileHandler(callback=callback)
+        handler.on_created(FileCreatedEvent(str(temp_dir / "a.txt")))
+        callback.assert_not_called()
+
+
+class TestBatchDispatcher:
+    def test_coalesces_burst_per_path(self):
+        callback = MagicMock()
+        dispatcher = _BatchDispatcher(callback, window_ms=50)
+        dispatcher.submit("/notes/a.md", "created")
+        for _ in range(10):
+            dispatcher.submit("/notes/a.md", "modified")
+        dispatcher.submit("/notes/b.md", "modified")
+        time.sleep(0.2)
+        assert callback.call_count == 2
+        callback.assert_any_call(Path("/notes/a.md"), event_type="modified")
+        callback.assert_any_call(Path("/notes/b.md"), event_type="modified")
+
+    def test_busy_path_does_not_delay_quiet_one(self):
+        calls = []
+        dispatcher = _BatchDispatcher(
+            lambda path, event_type: calls.append((path.name, time.monotonic())),
+            window_ms=50,
+        )
+        start = time.monotonic()
+        dispatcher.submit("/notes/quiet.md", "modified")
+        for _ in range(10):
+            dispatcher.submit("/notes/busy.md", "modified")
+            time.sleep(0.02)
+        time.sleep(0.15)
+
+        assert [name for name, _ in calls] == ["quiet.md", "busy.md"]
+        # quiet.md went out one window after its event, mid-burst
+        assert calls[0][1] - start < 0.15
+
+    def test_max_batch_forces_flush(self):
+        callback = MagicMock()
+        dispatcher = _BatchDispatcher(callback, window_ms=10_000, max_batch=2)
+        dispatcher.submit("/notes/a.md", "modified")
+        callback.assert_not_called()
+        dispatcher.submit("/notes/b.md", "modified")
+        assert callback.call_count == 2
+
+    def test_explicit_flush_and_callback_errors(self):
+        callback = MagicMock(side_effect=RuntimeError("boom"))
+        dispatcher = _BatchDispatcher(callback, window_ms=10_000)
+        dispatcher.submit("/notes/a.md", "modified")
+        dispatcher.flush()
+        callback.assert_called_once()
+        dispatcher.flush()
+        callback.assert_called_once()
+
+
+class TestFileWatcher:
+    def test_save_produces_single_callback(self, watch_dir):
+        calls = []
+        watcher = FileWatcher(
+            watch_dirs=[str(watch_dir)],
+            callback=lambda path, event_type: calls.append((path, event_type)),
+            batch_window_ms=50,
+        )
+        watcher.start()
+        try:
+            target = watch_dir / "note.md"
+            with open(target, 'w') as f:
+                f.write("# Part 1\n")
+                f.flush()
+                f.write("# Part 2\n")
+            deadline = time.time() + 3
+            while not calls and time.time() < deadline:
+                time.sleep(0.05)
+            time.sleep(0.2)
+        finally:
+            watcher.stop()
+
+        assert [path.name for path, _ in calls] == ["note.md"]
+
+    def test_atomic_rename_is_reported(self, watch_dir):
+        calls = []
+        watcher = FileWatcher(
+            watch_dirs=[str(watch_dir)],
+            callback=lambda path, event_type: calls.append(path.name),
+            batch_window_ms=50,
+        )
+        watcher.start()
+        try:
+            tmp = watch_dir / ".note.md.swp"
+            tmp.write_text("# Saved")
+            tmp.rename(watch_dir / "note.md")
+            deadline = time.time() + 3
+            while not calls and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+
+        assert "note.md" in calls
+
+    def test_callback_runs_off_watchdog_thread(self, watch_dir):
+        threads = []
+        watcher = FileWatcher(
+            watch_dirs=[str(watch_dir)],
+            callback=lambda path, event_type: threads.append(threading.current_thread().name),
+            batch_window_ms=0,
+        )
+        watcher._start_workers()
+        watcher._submit(watch_dir / "a.md", "modified")
+        watcher._stop_workers()
+        assert threads and threads[0].startswith("oc-watch-cb")
+
+    def test_full_queue_drops_oldest_event(self, watch_dir):
+        calls = []
+        watcher = FileWatcher(
+            watch_dirs=[str(watch_dir)],
+            callback=lambda path, event_type: calls.append(path.name),
+            callback_workers=1,
+            max_pending=2,
+        )
+        for name in ("a.md", "b.md", "c.md"):
+            watcher._submit(watch_dir / name, "modified")
+        watcher._start_workers()
+        watcher._stop_workers()
+        assert watcher.dropped_events == 1
+        assert calls == ["b.md", "c.md"]
+
+    def test_repeat_event_for_queued_path_is_coalesced(self, watch_dir):
+        calls = []
+        watcher = FileWatcher(
+            watch_dirs=[str(watch_dir)],
+            callback=lambda path, event_type: calls.append(path.name),
+            callback_workers=1,
+        )
+        for name in ("a.md", "b.md", "a.md", "a.md"):
+            watcher._submit(watch_dir / name, "modified")
+        watcher._start_workers()
+        watcher._stop_workers()
+        assert watcher.coalesced_events == 2
+        assert calls == ["a.md", "b.md"]
+
+        # Once a worker has taken the path, a new event queues it again
+        watcher._submit(watch_dir / "a.md", "modified")
+        watcher._start_workers()
+        watcher._stop_workers()
+        assert calls == ["a.md", "b.md", "a.md"]
+
+    def test_native_observer_by_default(self, watch_dir):
+        watcher = FileWatcher(watch_dirs=[str(watch_dir)])
+        assert not isinstance(watcher.observer, PollingObserver)
+        assert watcher.use_polling is False
+
+    def test_use_polling(self, watch_dir):
+        watcher = FileWatcher(watch_dirs=[str(watch_dir)], use_polling=True, poll_interval=5)
+        assert isinstance(watcher.observer, PollingObserver)
+        assert watcher.event_filter is None
+
+    def test_network_mount_switches_to_polling(self, watch_dir, monkeypatch):
+        monkeypatch.setattr('lib.file_watcher._is_network_fs', lambda path: True)
+        watcher = FileWatcher(watch_dirs=[str(watch_dir)])
+        assert isinstance(watcher.observer, PollingObserver)
+
+    def test_watch_limit_error_is_explained(self, watch_dir, caplog):
+        watcher = FileWatcher(watch_dirs=[str(watch_dir)])
+        watcher.observer.start = MagicMock(
+            side_effect=OSError(errno.ENOSPC, "inotify watch limit reached")
+        )
+        with pytest.raises(OSError):
+            watcher.start()
+        watcher._stop_workers()
+        assert "max_user_watches" in caplog.text
+
+
+class TestIsNetworkFs:
+    def test_longest_mount_wins(self, monkeypatch, tmp_path):
+        mounts = tmp_path / "mounts"
+        mounts.write_text(
+            "/dev/sda1 / ext4 rw 0 0\n"
+            "server:/export /mnt/nfs nfs4 rw 0 0\n"
+            "/dev/sdb1 /mnt/nfs/local ext4 rw 0 0\n"
+        )
+        real_open = open
+        monkeypatch.setattr(
+            'builtins.open',
+            lambda path, *a, **kw: real_open(mounts if path == '/proc/mounts' else path, *a, **kw),
+        )
+        assert _is_network_fs(Path("/mnt/nfs/notes"))
+        assert not _is_network_fs(Path("/mnt/nfs/local/notes"))
+        assert not _is_network_fs(Path("/mnt/nfsother"))
+        assert not _is_network_fs(Path("/home/user"))
+
+
+class TestLeafOnlyWatch:
+    def test_watches_only_dirs_with_supported_files(self, watch_dir):
+        (watch_dir / "notes").mkdir()
+        (watch_dir / "notes" / "a.md").write_text("# A")
+        (watch_dir / "assets" / "img").mkdir(parents=True)
+        (watch_dir / "assets" / "img" / "x.png").write_bytes(b"")
+
+        watcher = FileWatcher(watch_dirs=[str(watch_dir)], leaf_only=True)
+        watcher.start()
+        try:
+            watched = {Path(w.path).name for w in watcher.observer._watches}
+            assert all(not w.is_recursive for w in watcher.observer._watches)
+        finally:
+            watcher.stop()
+
+        assert watched == {watch_dir.name, "notes"}
+
+    def test_stop_forgets_scheduled_paths(self, watch_dir):
+        watcher = FileWatcher(watch_dirs=[str(watch_dir)], leaf_only=True)
+        watcher.start()
+        assert watcher._scheduled
+        watcher.stop()
+
+        assert not watcher._scheduled
+        assert not watcher.observer._watches
+
+    def test_new_directory_is_watched(self, watch_dir):
+        calls = []
+        watcher = FileWatcher(
+            watch_dirs=[str(watch_dir)],
+            callback=lambda path, event_type: calls.append(path.name),
+            batch_window_ms=50,
+            leaf_only=True,
+        )
+        watcher.start()
+        try:
+            new_dir = watch_dir / "inbox"
+            new_dir.mkdir()
+            deadline = time.time() + 3
+            while str(new_dir) not in watcher._scheduled and time.time() < deadline:
+                time.sleep(0.05)
+            (new_dir / "fresh.md").write_text("# Fresh")
+            while not calls and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            watcher.stop()
+
+        assert "fresh.md" in calls
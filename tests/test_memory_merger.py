@@ -3,6 +3,7 @@
 import pytest
 from datetime import datetime
 from pathlib import Path
+from unittest.mock import patch
 
 from lib.memory_merger import MemoryMerger, estimate_tokens, create_merger
 from lib.observer import Observation
@@ -26,6 +27,16 @@ class TestEstimateTokens:
         tokens = estimate_tokens(text)
         assert 1200 <= tokens <= 1400  # ~1000 * 1.3
 
+    def test_section_estimate_matches_joined_text(self, memory_dir):
+        merger = MemoryMerger(str(memory_dir))
+        sections = {
+            "Current Context": ["Working on  OC-Memory", ""],
+            "Observations Log": ["- 🔴 [decision] Use\tPostgreSQL", "- fact"],
+            "User Constraints": [],
+        }
+        joined = "".join("\n".join(lines) + "\n" for lines in sections.values())
+        assert merger._estimate_section_tokens(sections) == estimate_tokens(joined)
+
 
 class TestMemoryMerger:
     def test_init_creates_directory(self, temp_dir):
@@ -120,6 +131,19 @@ class TestMemoryMerger:
         merger.save(sections)
         assert merger.get_token_count() > 0
 
+    def test_token_count_cached_until_file_changes(self, memory_dir):
+        merger = MemoryMerger(str(memory_dir))
+        merger.add_entry("Observations Log", "- " + "word " * 50)
+        expected = estimate_tokens(merger.get_memory_file().read_text())
+
+        with patch.object(Path, 'read_text', side_effect=AssertionError("reread")):
+            assert merger.get_token_count() == expected
+
+        # An outside edit changes the size, so the file is counted again
+        with open(merger.get_memory_file(), 'a') as f:
+            f.write("extra words appended elsewhere\n")
+        assert merger.get_token_count() == estimate_tokens(merger.get_memory_file().read_text())
+
     def test_clear_section(self, memory_dir):
         merger = MemoryMerger(str(memory_dir))
         merger.add_entry("Observations Log", "- Test entry")
@@ -0,0 +1,249 @@
+"""Tests for memory_observer.py"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+import yaml
+
+from lib.error_handler import LLMRetryPolicy
+from lib.observer import Observation, Observer
+from memory_observer import MemoryObserver, _dedupe_observations, _overlapping_chunks
+
+
+@pytest.fixture
+def daemon(sample_config_file, watch_dir, monkeypatch):
+    # Keep ChromaDB out of unit tests
+    monkeypatch.setattr(MemoryObserver, '_init_memory_store', lambda self: None)
+    daemon = MemoryObserver(str(sample_config_file))
+    daemon.retry_policy = LLMRetryPolicy(max_attempts=1)
+    return daemon
+
+
+@pytest.fixture
+def obsidian_daemon(temp_dir, sample_config, watch_dir, monkeypatch):
+    sample_config['obsidian'] = {'enabled': True, 'vault_path': str(temp_dir / 'vault')}
+    config_path = temp_dir / 'obsidian.yaml'
+    config_path.write_text(yaml.dump(sample_config))
+    monkeypatch.setattr(MemoryObserver, '_init_memory_store', lambda self: None)
+    daemon = MemoryObserver(str(config_path))
+    yield daemon
+    if daemon._obsidian_sync_executor is not None:
+        daemon._obsidian_sync_executor.shutdown(wait=True)
+
+
+def _observation(content, category='fact'):
+    return Observation(
+        id=content, timestamp=datetime.now(), priority='medium',
+        category=category, content=content,
+    )
+
+
+@pytest.fixture
+def note(watch_dir):
+    path = watch_dir / "note.md"
+    path.write_text("# Note\nUser prefers tabs.\n")
+    return path
+
+
+class TestContentDedup:
+    def test_repeat_content_is_skipped(self, daemon, note):
+        assert daemon._unseen_content(note) == note.read_bytes()
+        assert daemon._unseen_content(note) is None
+
+        note.write_text("# Note\nUser prefers spaces.\n")
+        assert daemon._unseen_content(note) is not None
+
+    def test_failed_extraction_is_retried(self, daemon, note):
+        daemon.observer = Observer(api_key="fake-key")
+        daemon.observer._call_llm = MagicMock(side_effect=RuntimeError("rate limited"))
+
+        data = daemon._unseen_content(note)
+        assert daemon._extract_observations_from_file(note, data) is False
+        assert daemon._unseen_content(note) == data
+
+    def test_empty_extraction_is_not_retried(self, daemon, note):
+        daemon.observer = Observer(api_key="fake-key")
+        daemon.observer._call_llm = MagicMock(return_value='{"observations": []}')
+
+        data = daemon._unseen_content(note)
+        assert daemon._extract_observations_from_file(note, data) is False
+        assert daemon._unseen_content(note) is None
+
+    def test_failed_async_extraction_is_retried(self, daemon, note):
+        daemon.observer = Observer(api_key="fake-key")
+        daemon.observer._acall_llm = AsyncMock(side_effect=TimeoutError("timed out"))
+        daemon._merge_executor = ThreadPoolExecutor(max_workers=1)
+
+        data = daemon._unseen_content(note)
+        messages = daemon._read_messages(note, data)
+        try:
+            extracted = asyncio.run(
+                daemon._aextract_observations(note, messages, data)
+            )
+        finally:
+            daemon._merge_executor.shutdown(wait=True)
+        assert extracted is False
+        assert daemon._unseen_content(note) == data
+
+
+class TestReverseLookup:
+    @pytest.fixture
+    def lookup_daemon(self, daemon):
+        daemon.memory_store = MagicMock()
+        daemon.memory_store.search_batch.side_effect = lambda queries, n_results: [[] for _ in queries]
+        daemon.obsidian_client = MagicMock()
+        daemon.obsidian_client.search_notes.return_value = []
+        return daemon
+
+    def test_just_extracted_observation_is_known(self, lookup_daemon, note):
+        lookup_daemon._apply_observations(note, [_observation("User prefers tabs")])
+
+        assert len(lookup_daemon._obs_buffer) == 1
+        lookup_daemon.obsidian_client.search_notes.assert_not_called()
+
+    def test_topic_missing_from_store_is_recovered(self, lookup_daemon):
+        lookup_daemon._try_reverse_lookup([_observation("Project codename Falcon")])
+
+        lookup_daemon.memory_store.search_batch.assert_called_once()
+        lookup_daemon.obsidian_client.search_notes.assert_called_once()
+
+
+class TestStartStop:
+    def test_signal_during_startup_stops_daemon(self, daemon, monkeypatch):
+        monkeypatch.setattr('memory_observer.signal.signal', lambda *args: None)
+        # SIGTERM lands while the watcher is still starting
+        daemon.file_watcher.start = lambda: daemon._signal_handler(15, None)
+        daemon.stop = MagicMock()
+
+        runner = threading.Thread(target=daemon.start, daemon=True)
+        runner.start()
+        runner.join(timeout=2)
+        stuck = runner.is_alive()
+        daemon._stop_event.set()
+
+        assert not stuck
+        daemon.stop.assert_called_once()
+
+
+class TestOverlappingChunks:
+    def test_short_text_is_one_chunk(self):
+        assert _overlapping_chunks("abc", 10, 2) == ["abc"]
+        assert _overlapping_chunks("a" * 10, 10, 2) == ["a" * 10]
+
+    def test_windows_share_exact_overlap(self):
+        text = "".join(chr(ord('a') + i % 26) for i in range(250))
+        chunks = _overlapping_chunks(text, 100, 20)
+
+        assert [len(c) for c in chunks] == [100, 100, 90]
+        for left, right in zip(chunks, chunks[1:]):
+            assert left[-20:] == right[:20]
+        assert chunks[0] + "".join(c[20:] for c in chunks[1:]) == text
+
+    def test_windows_end_on_line_break(self):
+        text = "".join(f"line {i:02d} " + "x" * 20 + "\n" for i in range(20))
+        chunks = _overlapping_chunks(text, 100, 10)
+
+        assert len(chunks) > 1
+        for left, right in zip(chunks, chunks[1:]):
+            assert left.endswith("\n")
+            assert len(left) <= 100
+            assert left[-10:] == right[:10]
+        assert chunks[-1].endswith(text[-30:])
+
+    def test_line_break_inside_overlap_is_ignored(self):
+        # A cut inside the overlap would stop the window from advancing
+        text = "ab\n" + "c" * 200
+        chunks = _overlapping_chunks(text, 100, 10)
+        assert len(chunks[0]) == 100
+        assert chunks[0] + "".join(c[10:] for c in chunks[1:]) == text
+
+
+class TestDedupeObservations:
+    def test_overlap_repeats_are_dropped(self):
+        first = [_observation("User prefers tabs"), _observation("Deadline is Friday", 'task')]
+        second = [_observation("user  prefers TABS"), _observation("Uses Python")]
+
+        merged = _dedupe_observations([first, second])
+
+        assert [obs.content for obs in merged] == [
+            "User prefers tabs", "Deadline is Friday", "Uses Python",
+        ]
+
+    def test_category_is_part_of_the_key(self):
+        merged = _dedupe_observations([
+            [_observation("Ship v2", 'decision')], None, [_observation("Ship v2", 'task')],
+        ])
+        assert [obs.category for obs in merged] == ['decision', 'task']
+
+
+class TestObsidianSync:
+    def test_unchanged_files_are_not_recopied(self, obsidian_daemon):
+        daemon = obsidian_daemon
+        source = daemon._memory_dir / "note.md"
+        source.write_text("# Note\n")
+        target = daemon._obsidian_base / "hot" / "note.md"
+
+        daemon._sync_to_obsidian()
+        assert target.read_text() == "# Note\n"
+        assert str(source) in daemon._obsidian_sync_state
+
+        target.write_text("edited in vault")
+        daemon._sync_to_obsidian()
+        assert target.read_text() == "edited in vault"
+
+        source.write_text("# Note v2\n")
+        daemon._sync_to_obsidian()
+        assert target.read_text() == "# Note v2\n"
+
+        source.unlink()
+        daemon._sync_to_obsidian()
+        assert str(source) not in daemon._obsidian_sync_state
+
+    def test_state_survives_restart(self, obsidian_daemon, temp_dir):
+        daemon = obsidian_daemon
+        (daemon._memory_dir / "note.md").write_text("# Note\n")
+        daemon._sync_to_obsidian()
+        daemon._save_obsidian_sync_state()
+
+        restarted = MemoryObserver(str(temp_dir / 'obsidian.yaml'))
+        assert restarted._obsidian_sync_state == daemon._obsidian_sync_state
+
+    def test_unreadable_state_is_ignored(self, obsidian_daemon):
+        daemon = obsidian_daemon
+        daemon._obsidian_sync_state_path().write_text("{not json")
+        daemon._load_obsidian_sync_state()
+        assert daemon._obsidian_sync_state == {}
+
+
+class TestScheduler:
+    def test_failing_task_is_rescheduled(self, daemon):
+        def broken():
+            raise RuntimeError("boom")
+
+        daemon._run_and_reschedule(broken, 30)
+
+        [event] = daemon._scheduler.queue
+        assert event.argument == (broken, 30)
+
+    def test_loop_exits_when_stop_event_is_set(self, daemon, monkeypatch):
+        monkeypatch.setattr('memory_observer.signal.signal', lambda *args: None)
+        daemon.file_watcher.start = lambda: None
+        daemon.stop = MagicMock()
+
+        runner = threading.Thread(target=daemon.start, daemon=True)
+        runner.start()
+        deadline = time.monotonic() + 2
+        while not daemon._scheduler.queue and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert daemon._scheduler.queue  # periodic tasks are queued
+
+        daemon._signal_handler(15, None)
+        runner.join(timeout=2)
+
+        assert not runner.is_alive()
+        daemon.stop.assert_called_once()
@@ -1,6 +1,8 @@
 """Tests for lib/memory_writer.py"""
 
+import json
 import pytest
+import yaml
 from pathlib import Path
 from datetime import datetime
 
@@ -64,6 +66,20 @@ class TestMemoryWriter:
         assert path1.exists()
         assert path2.exists()
 
+    def test_copy_prunes_old_versions(self, memory_dir, temp_dir):
+        writer = MemoryWriter(str(memory_dir), max_versions_per_source=2)
+
+        source = temp_dir / "keep.md"
+        source.write_text("# Keep")
+        for i in range(4):
+            (memory_dir / f"keep_2026010{i}_000000.md").write_text(f"# v{i}")
+        (memory_dir / "other.md").write_text("# Other")
+
+        writer.copy_to_memory(source)
+
+        assert len(list(memory_dir.glob("keep*.md"))) == 2
+        assert (memory_dir / "other.md").exists()
+
     def test_add_metadata(self, memory_dir):
         writer = MemoryWriter(str(memory_dir))
 
@@ -97,7 +113,62 @@ class TestMemoryWriter:
 
         content = path.read_text()
         assert content.count("---") == 2  # opening and closing
-        assert "v: 2" in content
+        assert yaml.safe_load(content.split("---")[1]) == {"v": "2"}
+
+    def test_add_metadata_preserves_large_body(self, memory_dir):
+        writer = MemoryWriter(str(memory_dir))
+
+        body = "# Big\n" + ("line of text\n" * 20000)
+        path = memory_dir / "big.md"
+        path.write_text("---\nold: " + ("x" * 10000) + "\n---\n\n" + body)
+
+        writer.add_metadata(path, {"v": "new"})
+
+        content = path.read_text()
+        assert content == "---\nv: new\n---\n\n" + body
+        assert not list(memory_dir.glob(".*.tmp"))
+
+    def test_add_metadata_without_existing_frontmatter(self, memory_dir):
+        writer = MemoryWriter(str(memory_dir))
+        path = memory_dir / "plain.md"
+        path.write_bytes(b"--\n# Plain\n")
+
+        writer.add_metadata(path, {"v": "1"})
+
+        assert path.read_text() == "---\nv: '1'\n---\n\n--\n# Plain\n"
+
+    def test_add_metadata_escapes_values(self, memory_dir):
+        writer = MemoryWriter(str(memory_dir))
+        path = writer.write_memory_entry(content="# Test", filename="escape.md")
+
+        metadata = {"title": "Note: with colon", "summary": "line 1\nline 2", "count": 3}
+        writer.add_metadata(path, metadata)
+
+        frontmatter = path.read_text().split("---")[1]
+        assert yaml.safe_load(frontmatter) == metadata
+
+    def test_record_metadata_appends_to_index(self, memory_dir):
+        writer = MemoryWriter(str(memory_dir))
+        path = writer.write_memory_entry(content="# Test", filename="indexed.md")
+
+        writer.record_metadata(path, {"category": "notes", "event_type": "created"})
+        writer.record_metadata(path, {"category": "notes", "event_type": "modified"})
+        writer.close_index()
+
+        lines = (memory_dir / MemoryWriter.INDEX_FILENAME).read_text().splitlines()
+        assert [json.loads(line)["event_type"] for line in lines] == ["created", "modified"]
+        assert json.loads(lines[0])["path"] == "indexed.md"
+        # The memory file itself is not rewritten
+        assert path.read_text() == "# Test"
+
+    def test_record_metadata_buffers_until_flush(self, memory_dir):
+        writer = MemoryWriter(str(memory_dir))
+        writer.record_metadata(memory_dir / "a.md", {"category": "notes"})
+        index = memory_dir / MemoryWriter.INDEX_FILENAME
+        assert index.read_text() == ""
+        writer.flush_index()
+        assert json.loads(index.read_text())["path"] == "a.md"
+        writer.close_index()
 
     def test_get_category_from_path(self, memory_dir):
         writer = MemoryWriter(str(memory_dir))
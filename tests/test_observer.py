@@ -1,12 +1,20 @@
 """Tests for lib/observer.py"""
 
+import argparse
+import asyncio
 import json
+import os
+import stat as stat_module
 import pytest
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, AsyncMock, MagicMock
 
-from lib.observer import Observer, Observation, OBSERVER_SYSTEM_PROMPT, create_observer
+from lib.observer import (
+    Observer, Observation, ObservationBatch, OBSERVER_SYSTEM_PROMPT, create_observer,
+    _atomic_write, _detect_provider, _run_compress, _write_compressed,
+)
+from lib.reflector import ReflectionResult
 
 
 class TestObservation:
@@ -46,6 +54,19 @@ class TestObservation:
         assert d['metadata']['source'] == "test"
 
 
+class TestObservationBatch:
+    def test_markdown_matches_per_object_rendering(self):
+        ts = datetime(2026, 2, 13, 10, 30)
+        observations = [
+            Observation(id="1", timestamp=ts, priority="high", category="decision", content="A"),
+            Observation(id="2", timestamp=ts, priority="bogus", category="fact", content="B"),
+        ]
+        batch = ObservationBatch.from_observations(observations)
+        assert len(batch) == 2
+        assert batch.categories == ["decision", "fact"]
+        assert batch.to_markdown_lines() == [obs.to_markdown() for obs in observations]
+
+
 class TestObserver:
     def test_init_default_model(self):
         obs = Observer(provider="openai", api_key="test")
@@ -97,6 +118,9 @@ class TestObserver:
         results = obs._parse_response(response)
         assert len(results) == 1
 
+    def test_prompt_requests_observations_object(self):
+        assert '{"observations": []}' in OBSERVER_SYSTEM_PROMPT
+
     def test_parse_response_invalid_json(self):
         obs = Observer(api_key="test")
         results = obs._parse_response("not json at all")
@@ -148,6 +172,15 @@ class TestObserver:
         assert len(messages) == 2
         assert messages[0]['role'] == "user"
 
+    def test_read_jsonl_log_blank_and_empty(self, temp_dir):
+        log_file = temp_dir / "blank.jsonl"
+        log_file.write_text('\n\n' + json.dumps({"role": "user", "content": "Hi"}) + '\n\n[1, 2]\n')
+        assert Observer._read_jsonl_log(log_file) == [{"role": "user", "content": "Hi"}]
+
+        empty_file = temp_dir / "empty.jsonl"
+        empty_file.write_text('')
+        assert Observer._read_jsonl_log(empty_file) == []
+
     def test_read_jsonl_log_missing_file(self, temp_dir):
         messages = Observer._read_jsonl_log(temp_dir / "missing.jsonl")
         assert messages == []
@@ -207,6 +240,12 @@ class TestObserverLLMIntegration:
 
         assert result == []
 
+    def test_observe_raise_errors_propagates(self):
+        obs = Observer(api_key="fake-key")
+        with patch.object(obs, '_call_llm', side_effect=Exception("API error")):
+            with pytest.raises(Exception, match="API error"):
+                obs.observe([{"role": "user", "content": "test"}], raise_errors=True)
+
     def test_observe_llm_returns_malformed_json(self):
         """LLM returns non-JSON response, handled gracefully"""
         obs = Observer(api_key="fake-key")
@@ -215,6 +254,124 @@ class TestObserverLLMIntegration:
 
         assert result == []
 
+    def test_client_reused_until_key_changes(self):
+        """SDK client is built once per API key"""
+        fake_openai = MagicMock()
+        obs = Observer(api_key="fake-key")
+        with patch.dict('sys.modules', {'openai': fake_openai}):
+            obs._call_openai("user: hi")
+            obs._call_openai("user: again")
+            assert fake_openai.OpenAI.call_count == 1
+
+            obs.api_key = "rotated-key"
+            obs._call_openai("user: hi")
+            assert fake_openai.OpenAI.call_count == 2
+            fake_openai.OpenAI.assert_called_with(api_key="rotated-key")
+
+    def test_aobserve_concurrent_calls(self):
+        """aobserve() parses like observe() and calls can overlap"""
+        obs = Observer(api_key="fake-key")
+        in_flight = peak = 0
+
+        async def fake_llm(text):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return json.dumps([{"priority": "high", "category": "fact", "content": text[-5:]}])
+
+        async def run():
+            return await asyncio.gather(*(
+                obs.aobserve([{"role": "user", "content": f"note{i}"}]) for i in range(5)
+            ))
+
+        with patch.object(obs, '_acall_llm', side_effect=fake_llm):
+            results = asyncio.run(run())
+
+        assert peak == 5
+        assert [r[0].content for r in results] == [f"note{i}" for i in range(5)]
+
+    def test_aobserve_llm_raises_exception(self):
+        obs = Observer(api_key="fake-key")
+        with patch.object(obs, '_acall_llm', AsyncMock(side_effect=Exception("API timeout"))):
+            result = asyncio.run(obs.aobserve([{"role": "user", "content": "test"}]))
+            with pytest.raises(Exception, match="API timeout"):
+                asyncio.run(obs.aobserve(
+                    [{"role": "user", "content": "test"}], raise_errors=True
+                ))
+
+        assert result == []
+
+
+class TestObserverBatching:
+    """Tests for observe_async() request aggregation"""
+
+    def test_batches_concurrent_conversations(self):
+        obs = Observer(api_key="fake-key", batch_window_ms=10_000)
+        mock_response = json.dumps({"by_id": {
+            "1": [{"priority": "high", "category": "decision", "content": "Use Rust"}],
+            "2": [{"priority": "low", "category": "fact", "content": "Office is in Seoul"}],
+        }})
+        with patch.object(obs, '_call_llm', return_value=mock_response) as mock_llm:
+            f1 = obs.observe_async([{"role": "user", "content": "Let's use Rust"}])
+            f2 = obs.observe_async([{"role": "user", "content": "Our office is in Seoul"}])
+            obs.flush_batch()
+
+        assert mock_llm.call_count == 1
+        assert "## Conversation 2" in mock_llm.call_args[0][0]
+        assert [o.content for o in f1.result(timeout=1)] == ["Use Rust"]
+        assert [o.content for o in f2.result(timeout=1)] == ["Office is in Seoul"]
+
+    def test_single_pending_uses_plain_prompt(self):
+        obs = Observer(api_key="fake-key", batch_window_ms=10)
+        mock_response = json.dumps([{"priority": "medium", "category": "fact", "content": "Solo"}])
+        with patch.object(obs, '_call_llm', return_value=mock_response) as mock_llm:
+            future = obs.observe_async([{"role": "user", "content": "solo"}])
+            result = future.result(timeout=2)
+
+        assert [o.content for o in result] == ["Solo"]
+        assert mock_llm.call_args.kwargs.get('system_prompt') is None
+
+    def test_batch_failure_resolves_empty(self):
+        obs = Observer(api_key="fake-key", batch_window_ms=10_000, max_batch_chars=1)
+        with patch.object(obs, '_call_llm', side_effect=Exception("API timeout")):
+            future = obs.observe_async([{"role": "user", "content": "test"}])
+
+        assert future.result(timeout=1) == []
+
+    def test_single_shape_reply_fails_batch(self, caplog):
+        obs = Observer(api_key="fake-key", batch_window_ms=10_000)
+        mock_response = json.dumps({"observations": [
+            {"priority": "high", "category": "decision", "content": "Use Rust"},
+        ]})
+        with patch.object(obs, '_call_llm', return_value=mock_response):
+            f1 = obs.observe_async([{"role": "user", "content": "Let's use Rust"}])
+            f2 = obs.observe_async([{"role": "user", "content": "Our office is in Seoul"}])
+            obs.flush_batch()
+
+        assert f1.result(timeout=1) == [] and f2.result(timeout=1) == []
+        assert "no 'by_id' map" in caplog.text
+        with pytest.raises(ValueError, match="by_id"):
+            obs._parse_batch_response(mock_response)
+
+    def test_batch_prompt_asks_only_for_by_id(self):
+        from lib.observer import OBSERVER_BATCH_SYSTEM_PROMPT
+        assert '"by_id"' in OBSERVER_BATCH_SYSTEM_PROMPT
+        assert '{"observations"' not in OBSERVER_BATCH_SYSTEM_PROMPT
+
+    def test_prompt_overhead_counts_toward_flush(self):
+        from lib.observer import _BATCH_PROMPT_CHARS
+        obs = Observer(
+            api_key="fake-key", batch_window_ms=10_000,
+            max_batch_chars=_BATCH_PROMPT_CHARS + 50,
+        )
+        with patch.object(obs, '_call_llm', return_value="[]") as mock_llm:
+            future = obs.observe_async([{"role": "user", "content": "x" * 60}])
+            assert future.result(timeout=1) == []
+
+        assert mock_llm.call_count == 1
+
 
 class TestCreateObserver:
     def test_create_from_config(self):
@@ -233,3 +390,279 @@ class TestCreateObserver:
         obs = create_observer({})
         assert obs.provider == "openai"
         assert obs.model == "gpt-4o-mini"
+
+
+class TestAtomicWrite:
+    def test_replaces_content_and_keeps_mode(self, temp_dir):
+        target = temp_dir / "active_memory.md"
+        target.write_text("old")
+        target.chmod(0o640)
+        _atomic_write(target, "new ✓".encode('utf-8'))
+
+        assert target.read_text(encoding='utf-8') == "new ✓"
+        assert target.stat().st_mode & 0o777 == 0o640
+        assert [p.name for p in temp_dir.iterdir()] == ["active_memory.md"]
+
+
+class TestDetectProvider:
+    @pytest.mark.parametrize("model,provider", [
+        ("gemini-2.0-flash", "google"),
+        ("gpt-4o-mini", "openai"),
+        ("o3-mini", "openai"),
+    ])
+    def test_detect_provider(self, model, provider):
+        assert _detect_provider(model) == provider
+
+
+def _fake_reflect_batch(compressed: str = "- short"):
+    """Stand-in for Reflector.areflect_batch that compresses every item to `compressed`"""
+    async def fake_batch(items, level=1):
+        return {
+            item_id: ReflectionResult(130, 2, 65.0, compressed, level, datetime.now())
+            for item_id, _ in items
+        }
+    return fake_batch
+
+
+def _patch_reflect_batch(compressed: str = "- short"):
+    return patch(
+        'lib.reflector.Reflector.areflect_batch',
+        side_effect=_fake_reflect_batch(compressed),
+    )
+
+
+class TestRunCompress:
+    def test_targets_chunked_by_batch_tokens(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        targets = []
+        for name in ("a.md", "b.md", "c.md"):
+            target = temp_dir / name
+            target.write_text("word " * 100)
+            targets.append(str(target))
+        args = argparse.Namespace(
+            target=targets, model="gpt-4o-mini",
+            compression_target=0.5, batch_tokens=300, min_bytes=0,
+        )
+
+        with _patch_reflect_batch() as mock_batch:
+            assert _run_compress(args) == 0
+
+        # 130 tokens per file, 300 budget -> [a, b] then [c]
+        assert sorted(len(call.args[0]) for call in mock_batch.call_args_list) == [1, 2]
+        assert (temp_dir / "c.md").read_text() == "- short"
+
+    def test_chunks_run_concurrently(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        targets = []
+        for name in ("a.md", "b.md"):
+            target = temp_dir / name
+            target.write_text("word " * 100)
+            targets.append(str(target))
+        args = argparse.Namespace(
+            target=targets, model="gpt-4o-mini",
+            compression_target=0.5, batch_tokens=1, max_concurrency=2,
+            min_bytes=0,
+        )
+        in_flight = []
+        peak = []
+
+        compress = _fake_reflect_batch()
+
+        async def tracking_batch(items, level=1):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.05)
+            in_flight.pop()
+            return await compress(items, level)
+
+        with patch('lib.reflector.Reflector.areflect_batch', side_effect=tracking_batch):
+            assert _run_compress(args) == 0
+
+        assert max(peak) == 2
+
+    def test_failed_chunk_does_not_abort_others(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        targets = []
+        for name in ("a.md", "b.md", "c.md"):
+            target = temp_dir / name
+            target.write_text(f"{name} " + "word " * 100)
+            targets.append(str(target))
+        args = argparse.Namespace(
+            target=targets, model="gpt-4o-mini",
+            compression_target=0.5, batch_tokens=1, min_bytes=0,
+        )
+        compress = _fake_reflect_batch()
+
+        async def flaky_batch(items, level=1):
+            if items[0][1].startswith("b.md"):
+                raise RuntimeError("rate limited")
+            await asyncio.sleep(0.01)
+            return await compress(items, level)
+
+        with patch('lib.reflector.Reflector.areflect_batch', side_effect=flaky_batch):
+            assert _run_compress(args) == 0
+
+        assert (temp_dir / "a.md").read_text() == "- short"
+        assert (temp_dir / "b.md").read_text().startswith("b.md word")
+        assert (temp_dir / "c.md").read_text() == "- short"
+
+    def test_write_error_skips_only_that_file(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        targets = []
+        for name in ("a.md", "b.md"):
+            target = temp_dir / name
+            target.write_text("word " * 100)
+            targets.append(str(target))
+        args = argparse.Namespace(
+            target=targets, model="gpt-4o-mini", compression_target=0.5, min_bytes=0,
+        )
+        def failing_write(path, content):
+            if path.name == "a.md":
+                raise OSError("disk full")
+            _write_compressed(path, content)
+
+        monkeypatch.setattr('lib.observer._write_compressed', failing_write)
+        with _patch_reflect_batch():
+            assert _run_compress(args) == 0
+
+        assert (temp_dir / "a.md").read_text().startswith("word")
+        assert (temp_dir / "b.md").read_text() == "- short"
+
+    def test_file_emptied_before_mmap_is_skipped(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        (temp_dir / "a.md").write_text("")
+        (temp_dir / "b.md").write_text("word " * 100)
+        args = argparse.Namespace(
+            target=[str(temp_dir / "a.md"), str(temp_dir / "b.md")],
+            model="gpt-4o-mini", compression_target=0.5, min_bytes=0,
+        )
+        def stale(real_stat):
+            # a.md still looked non-empty when it was stat'ed
+            def stat(*args, **kwargs):
+                st = real_stat(*args, **kwargs)
+                if st.st_size or not stat_module.S_ISREG(st.st_mode):
+                    return st
+                fields = list(st)
+                fields[6] = 500  # st_size
+                return os.stat_result(fields)
+            return stat
+
+        monkeypatch.setattr(os, 'stat', stale(os.stat))
+        monkeypatch.setattr(os, 'fstat', stale(os.fstat))
+        with _patch_reflect_batch():
+            assert _run_compress(args) == 0
+
+        assert (temp_dir / "b.md").read_text() == "- short"
+
+    def test_unchanged_file_skipped_on_next_run(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        target = temp_dir / "a.md"
+        target.write_text("word " * 100)
+        args = argparse.Namespace(
+            target=[str(target)], model="gpt-4o-mini", compression_target=0.5,
+            min_bytes=0,
+        )
+
+        with _patch_reflect_batch() as mock_batch:
+            assert _run_compress(args) == 0
+            assert _run_compress(args) == 0
+            assert mock_batch.call_count == 1
+
+            target.write_text("new words " * 100)
+            assert _run_compress(args) == 0
+            assert mock_batch.call_count == 2
+
+    def test_target_ratio_one_skips_read(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        target = temp_dir / "a.md"
+        target.write_text("word " * 100)
+        args = argparse.Namespace(
+            target=[str(target)], model="gpt-4o-mini", compression_target=1.0,
+        )
+        with patch.object(Path, 'read_text', side_effect=AssertionError("read")):
+            assert _run_compress(args) == 0
+
+    def test_unchanged_stat_skips_read(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        target = temp_dir / "a.md"
+        target.write_text("word " * 100)
+        args = argparse.Namespace(
+            target=[str(target)], model="gpt-4o-mini", compression_target=0.5,
+            min_bytes=0,
+        )
+
+        with _patch_reflect_batch():
+            assert _run_compress(args) == 0
+
+        with patch('lib.observer.mmap.mmap', side_effect=AssertionError("target re-read")):
+            assert _run_compress(args) == 0
+
+    def test_touched_file_matched_by_digest(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        target = temp_dir / "a.md"
+        target.write_text("word " * 100)
+        args = argparse.Namespace(
+            target=[str(target)], model="gpt-4o-mini", compression_target=0.5,
+            min_bytes=0,
+        )
+
+        with _patch_reflect_batch("- short ✓") as mock_batch:
+            assert _run_compress(args) == 0
+            os.utime(target, ns=(0, 0))
+            assert _run_compress(args) == 0
+
+        assert mock_batch.call_count == 1
+
+    def test_decoded_like_read_text(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        target = temp_dir / "a.md"
+        target.write_bytes("wörd\r\n".encode('utf-8') * 100 + b"end\r")
+        args = argparse.Namespace(
+            target=[str(target)], model="gpt-4o-mini", compression_target=0.5,
+            min_bytes=0,
+        )
+        expected = target.read_text(encoding='utf-8')
+
+        with _patch_reflect_batch() as mock_batch:
+            assert _run_compress(args) == 0
+
+        [(_, sent)] = mock_batch.call_args.args[0]
+        assert sent == expected
+
+    def test_truncated_utf8_raises(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        target = temp_dir / "a.md"
+        target.write_bytes(("word " * 100).encode('utf-8') + "ö".encode('utf-8')[:1])
+        args = argparse.Namespace(
+            target=[str(target)], model="gpt-4o-mini", compression_target=0.5,
+            min_bytes=0,
+        )
+        with _patch_reflect_batch() as mock_batch, pytest.raises(UnicodeDecodeError):
+            _run_compress(args)
+        mock_batch.assert_not_called()
+
+    def test_small_files_skip_llm(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        target = temp_dir / "a.md"
+        target.write_text("word " * 100)
+        args = argparse.Namespace(
+            target=[str(target)], model="gpt-4o-mini", compression_target=0.5,
+        )
+        with patch('lib.reflector.Reflector.areflect_batch') as mock_batch:
+            assert _run_compress(args) == 0
+        mock_batch.assert_not_called()
+
+    def test_duplicate_targets_compressed_once(self, temp_dir, monkeypatch):
+        monkeypatch.setenv("LLM_API_KEY", "fake-key")
+        monkeypatch.chdir(temp_dir)
+        target = temp_dir / "a.md"
+        target.write_text("word " * 100)
+        args = argparse.Namespace(
+            target=[str(target), "a.md", "./a.md"], model="gpt-4o-mini",
+            compression_target=0.5, min_bytes=0,
+        )
+
+        with _patch_reflect_batch() as mock_batch:
+            assert _run_compress(args) == 0
+
+        assert [len(call.args[0]) for call in mock_batch.call_args_list] == [1]
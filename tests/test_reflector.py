@@ -1,7 +1,8 @@
 """Tests for lib/reflector.py"""
 
+import asyncio
 import pytest
-from unittest.mock import patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from lib.reflector import Reflector, ReflectionResult, create_reflector
 
 
@@ -132,6 +133,88 @@ class TestReflectorLLMIntegration:
         assert stats['average_ratio'] > 1.0
 
 
+class TestReflectorAsync:
+    def test_areflect_batch_single_call(self):
+        r = Reflector(api_key="fake-key")
+        response = (
+            "<<FILE id=0>>\n- Uses Rust\n<<END>>\n"
+            "<<FILE id=1>>\n- Office in Seoul\n<<END>>"
+        )
+        items = [
+            ("0", "The user decided that the project will use Rust for the core"),
+            ("1", "The user mentioned that their office is located in Seoul, Korea"),
+        ]
+        with patch.object(r, '_acall_llm', AsyncMock(return_value=response)) as mock_llm:
+            results = asyncio.run(r.areflect_batch(items, level=2))
+
+        assert mock_llm.await_count == 1
+        assert "<<FILE id=1>>" in mock_llm.call_args[0][0]
+        assert results["0"].compressed_content == "- Uses Rust"
+        assert results["1"].compressed_content == "- Office in Seoul"
+        assert all(res.level == 2 for res in results.values())
+        assert len(r.history) == 2
+
+    def test_areflect_batch_missing_id_falls_back(self):
+        """Items absent from the batched response are compressed alone"""
+        r = Reflector(api_key="fake-key")
+        responses = [
+            "<<FILE id=a>>\n- Short A\n<<END>>",
+            "- Short B",
+        ]
+        items = [("a", "A long original text for a"), ("b", "A long original text for b")]
+        with patch.object(r, '_acall_llm', AsyncMock(side_effect=responses)) as mock_llm:
+            results = asyncio.run(r.areflect_batch(items))
+
+        assert mock_llm.await_count == 2
+        assert results["a"].compressed_content == "- Short A"
+        assert results["b"].compressed_content == "- Short B"
+
+    def test_areflect_failure_returns_original(self):
+        r = Reflector(api_key="fake-key")
+        with patch.object(r, '_acall_llm', AsyncMock(side_effect=Exception("API error"))):
+            result = asyncio.run(r.areflect("Some observations", level=2))
+
+        assert result.compression_ratio == 1.0
+        assert result.compressed_content == "Some observations"
+
+    def test_async_client_rebuilt_per_event_loop(self):
+        fake_openai = MagicMock()
+        completion = MagicMock()
+        completion.choices[0].message.content = "- short"
+        fake_openai.AsyncOpenAI.return_value.chat.completions.create = AsyncMock(
+            return_value=completion
+        )
+        r = Reflector(api_key="fake-key")
+
+        async def two_calls():
+            await r._acall_openai("a")
+            await r._acall_openai("b")
+
+        with patch.dict('sys.modules', {'openai': fake_openai}):
+            asyncio.run(two_calls())
+            assert fake_openai.AsyncOpenAI.call_count == 1
+            asyncio.run(two_calls())
+            assert fake_openai.AsyncOpenAI.call_count == 2
+
+    def test_sync_and_async_send_same_request(self):
+        fake_openai = MagicMock()
+        completion = MagicMock()
+        completion.choices[0].message.content = "- short"
+        fake_openai.OpenAI.return_value.chat.completions.create.return_value = completion
+        fake_openai.AsyncOpenAI.return_value.chat.completions.create = AsyncMock(
+            return_value=completion
+        )
+        r = Reflector(api_key="fake-key")
+
+        with patch.dict('sys.modules', {'openai': fake_openai}):
+            r._call_openai("compress me")
+            asyncio.run(r._acall_openai("compress me"))
+
+        sync_kwargs = fake_openai.OpenAI.return_value.chat.completions.create.call_args.kwargs
+        async_kwargs = fake_openai.AsyncOpenAI.return_value.chat.completions.create.call_args.kwargs
+        assert sync_kwargs == async_kwargs == r._openai_request("compress me")
+
+
 class TestCreateReflector:
     def test_create_from_config(self):
         config = {
@@ -0,0 +1,43 @@
+"""Tests for setup.py"""
+
+import pytest
+
+pytest.importorskip("questionary")
+
+from setup import SetupWizard  # noqa: E402
+
+
+@pytest.fixture
+def wizard(temp_dir):
+    wizard = SetupWizard()
+    wizard.env_path = temp_dir / ".env"
+    return wizard
+
+
+class TestSaveToEnv:
+    def test_new_file_gets_header(self, wizard):
+        wizard._save_to_env("OPENAI_API_KEY", "sk-1")
+        content = wizard.env_path.read_text()
+        assert content.startswith("# OC-Memory Environment Variables")
+        assert content.endswith("OPENAI_API_KEY=sk-1\n")
+
+    def test_other_lines_survive(self, wizard):
+        original = (
+            "# my settings\n"
+            "export FOO=bar\n"
+            "BAZ = qux\n"
+            "\n"
+            "OPENAI_API_KEY=old\n"
+            "OK=1\n"
+        )
+        wizard.env_path.write_text(original)
+        wizard._save_to_env("OPENAI_API_KEY", "new")
+        assert wizard.env_path.read_text() == original.replace("=old", "=new")
+
+    def test_replaces_spaced_and_exported_key_in_place(self, wizard):
+        wizard.env_path.write_text("export GOOGLE_API_KEY = old\nOTHER=1")
+        wizard._save_to_env("GOOGLE_API_KEY", "new")
+        wizard._save_to_env("DROPBOX_APP_KEY", "dbx")
+        assert wizard.env_path.read_text() == (
+            "export GOOGLE_API_KEY=new\nOTHER=1\nDROPBOX_APP_KEY=dbx\n"
+        )